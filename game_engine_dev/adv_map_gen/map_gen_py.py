@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+
+#================================================================================================================================#
+#=> - Imports -
+#================================================================================================================================#
+
+import ctypes
+import os
+import sys
+
+import numpy as np
+
+sys.dont_write_bytecode = True
+
+#================================================================================================================================#
+#=> - Constants -
+#================================================================================================================================#
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+LIB_PATH_DEF = os.path.join(ROOT, "map_gen.so")
+MAP_CONTINENTAL = 1
+MAP_TYPES = {"continental": MAP_CONTINENTAL}
+
+#================================================================================================================================#
+#=> - Ctypes mirrors of map_gen_api.h / map_config.h -
+#================================================================================================================================#
+
+class MapConfigC(ctypes.Structure):
+    _fields_ = [
+        ("m_perlin_lacunarity", ctypes.c_float),
+        ("m_perlin_layer_freq_base", ctypes.c_float),
+        ("m_perlin_layer_weight", ctypes.c_float),
+        ("m_perlin_layer_freq_step", ctypes.c_float),
+        ("m_perlin_layer_count", ctypes.c_int32),
+        ("m_shaped_radial_near", ctypes.c_float),
+        ("m_shaped_near_ocean", ctypes.c_uint8),
+        ("m_shaped_near_sea", ctypes.c_uint8),
+        ("m_shaped_near_coastal", ctypes.c_uint8),
+        ("m_shaped_radial_far", ctypes.c_float),
+        ("m_shaped_far_ocean", ctypes.c_uint8),
+        ("m_shaped_far_sea", ctypes.c_uint8),
+        ("m_shaped_far_coastal", ctypes.c_uint8),
+        ("m_land_alt_lim_hills", ctypes.c_float),
+        ("m_land_alt_lim_mtn", ctypes.c_float),
+        ("m_delta_flood_perc", ctypes.c_uint16),
+    ]
+
+class MapGenReqC(ctypes.Structure):
+    _fields_ = [
+        ("m_seed", ctypes.c_uint32),
+        ("m_type", ctypes.c_uint8),
+        ("m_w", ctypes.c_uint16),
+        ("m_h", ctypes.c_uint16),
+        ("m_cfg", MapConfigC),
+        ("m_statics", ctypes.c_void_p),
+    ]
+
+class MakeMapRsltC(ctypes.Structure):
+    _fields_ = [
+        ("m_ok", ctypes.c_bool),
+        ("m_w", ctypes.c_uint16),
+        ("m_h", ctypes.c_uint16),
+        ("m_terrain", ctypes.POINTER(ctypes.c_uint8)),
+        ("m_climate", ctypes.POINTER(ctypes.c_uint8)),
+        ("m_rivers", ctypes.POINTER(ctypes.c_uint8)),
+        ("m_overlay", ctypes.POINTER(ctypes.c_uint8)),
+        ("m_resources", ctypes.POINTER(ctypes.c_uint16)),
+    ]
+
+#================================================================================================================================#
+#=> - Functions -
+#================================================================================================================================#
+
+def map_config_def():
+    # Keep in sync with map_config_def() in map_config.h.
+    return {
+        "m_perlin_lacunarity": 2.0,
+        "m_perlin_layer_freq_base": 0.5,
+        "m_perlin_layer_weight": 0.2,
+        "m_perlin_layer_freq_step": 1.62,
+        "m_perlin_layer_count": 5,
+        "m_shaped_radial_near": 0.0,
+        "m_shaped_near_ocean": 18,
+        "m_shaped_near_sea": 12,
+        "m_shaped_near_coastal": 8,
+        "m_shaped_radial_far": 0.9,
+        "m_shaped_far_ocean": 10,
+        "m_shaped_far_sea": 20,
+        "m_shaped_far_coastal": 10,
+        "m_land_alt_lim_hills": 0.30,
+        "m_land_alt_lim_mtn": 0.70,
+        "m_delta_flood_perc": 3,
+    }
+
+def _make_cfg(cfg):
+    vals = map_config_def()
+    if cfg:
+        unknown = set(cfg) - set(vals)
+        if unknown:
+            raise KeyError("unknown MapConfig field(s): %s" % ", ".join(sorted(unknown)))
+        vals.update(cfg)
+    return MapConfigC(**vals)
+
+#================================================================================================================================#
+#=> - MapGenRslt -
+#================================================================================================================================#
+
+class MapGenRsltOwner(object):
+    """Holds one MakeMapRslt; it is freed when the owner is collected, i.e. once no layer array refers to it."""
+
+    def __init__(m, lib, rslt):
+        m.m_lib = lib
+        m.m_rslt = rslt
+
+    def view(m, ptr, shape):
+        # Wrap the C buffer in an object whose __array_interface__ keeps m alive: it becomes the array's .base.
+        arr = np.ctypeslib.as_array(ptr, shape=shape)
+        return np.asarray(MapGenLayerRef(m, arr.__array_interface__))
+
+    def __del__(m):
+        if m.m_rslt is None:
+            return
+        m.m_lib.map_gen_free_rslt(ctypes.byref(m.m_rslt))
+        m.m_rslt = None
+
+class MapGenLayerRef(object):
+
+    def __init__(m, owner, array_interface):
+        m.m_owner = owner
+        m.__array_interface__ = array_interface
+
+class MapGenRslt(object):
+    """One generated map; the arrays are views of C memory that stays allocated while any of them is alive."""
+
+    def __init__(m, lib, rslt):
+        m.w = rslt.m_w
+        m.h = rslt.m_h
+        shape = (m.h, m.w)
+        owner = MapGenRsltOwner(lib, rslt)
+        m.terrain = owner.view(rslt.m_terrain, shape)
+        m.climate = owner.view(rslt.m_climate, shape)
+        m.rivers = owner.view(rslt.m_rivers, shape)
+        m.overlay = owner.view(rslt.m_overlay, shape)
+        m.resources = owner.view(rslt.m_resources, shape)
+
+    def layers(m):
+        return {"terrain": m.terrain, "climate": m.climate, "rivers": m.rivers,
+                "overlay": m.overlay, "resources": m.resources}
+
+    def copy_layers(m):
+        return {k: v.copy() for k, v in m.layers().items()}
+
+    def free(m):
+        # Drops this object's views; the C result goes with the last array still held elsewhere.
+        m.terrain = m.climate = m.rivers = m.overlay = m.resources = None
+
+    def __enter__(m):
+        return m
+
+    def __exit__(m, exc_type, exc, tb):
+        m.free()
+
+#================================================================================================================================#
+#=> - MapGenLib -
+#================================================================================================================================#
+
+class MapGenLib(object):
+    """ctypes front end for map_gen.so (build with map_gen_lib_comp)."""
+
+    def __init__(m, lib_path=LIB_PATH_DEF):
+        if not os.path.isfile(lib_path):
+            raise FileNotFoundError("*** Error: %s not found. Run map_gen_lib_comp first." % lib_path)
+        m.m_lib = ctypes.CDLL(lib_path)
+        m.m_lib.map_gen_generate.argtypes = [ctypes.POINTER(MapGenReqC)]
+        m.m_lib.map_gen_generate.restype = MakeMapRsltC
+        m.m_lib.map_gen_free_rslt.argtypes = [ctypes.POINTER(MakeMapRsltC)]
+        m.m_lib.map_gen_free_rslt.restype = None
+
+    def generate(m, seed, map_w=1000, map_h=1000, map_type=MAP_CONTINENTAL, cfg=None):
+        req = MapGenReqC()
+        req.m_seed = seed
+        req.m_type = map_type
+        req.m_w = map_w
+        req.m_h = map_h
+        req.m_cfg = _make_cfg(cfg)
+        req.m_statics = None
+        rslt = m.m_lib.map_gen_generate(ctypes.byref(req))
+        if not rslt.m_ok:
+            return None
+        return MapGenRslt(m.m_lib, rslt)
+
+#================================================================================================================================#
+#=> - Main -
+#================================================================================================================================#
+
+if __name__ == "__main__":
+    seed = int(sys.argv[1]) if len(sys.argv) >= 2 else 101
+    lib = MapGenLib()
+    rslt = lib.generate(seed)
+    if rslt is None:
+        print("map_gen_generate failed for seed %d" % seed)
+        raise SystemExit(1)
+    with rslt:
+        for name, arr in rslt.layers().items():
+            print("%-10s %s %s min %d max %d" % (name, arr.dtype, arr.shape, arr.min(), arr.max()))
+
+#================================================================================================================================#
+#=> - End -
+#================================================================================================================================#
@@ -5,17 +5,24 @@
 #================================================================================================================================#
 
 import argparse
+import json
 import os
 import subprocess
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 sys.dont_write_bytecode = True
 
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from p1_map_cache import cache_restore, cache_store, map_cache_key, tester_hash
+
 #================================================================================================================================#
 #=> - Constants -
 #================================================================================================================================#
 
-ROOT = os.path.dirname(os.path.abspath(__file__))
 OUT_ROOT = "/home/w/Projects/simple-map-gen"
 MAKE_MAP_MOD = "p1_make_map"
 MAP_W_DEF = 1000
@@ -23,6 +30,7 @@ MAP_H_DEF = 1000
 SEED_START_DEF = 0
 SEED_END_DEF = 100
 EXPORT_KINDS = ("terrain", "climate", "rivers", "overlay")
+MANIFEST_DEF = os.path.join(OUT_ROOT, "p1-generate-manifest.json")
 
 #================================================================================================================================#
 #=> - Functions -
@@ -62,6 +70,37 @@ def run_make_map(seed, map_w, map_h):
         return False, "missing export(s): %s" % ", ".join(missing)
     return True, proc.stdout.strip()
 
+def run_seed_job(seed, map_w, map_h, bin_hash, use_cache):
+    start = time.perf_counter()
+    key = map_cache_key(seed, map_w, map_h, bin_hash, "subdir")
+    paths = {k: map_export_path(seed, k) for k in EXPORT_KINDS}
+    if use_cache and cache_restore(key, paths):
+        return seed, key, True, True, "", time.perf_counter() - start
+    ok, msg = run_make_map(seed, map_w, map_h)
+    if ok and use_cache:
+        cache_store(key, paths)
+    return seed, key, ok, False, msg, time.perf_counter() - start
+
+def load_manifest(path, map_w, map_h):
+    if not os.path.isfile(path):
+        return {"width": map_w, "height": map_h, "seeds": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("width") != map_w or manifest.get("height") != map_h:
+        print("manifest %s is for %sx%s, starting a fresh one" % (path, manifest.get("width"), manifest.get("height")))
+        return {"width": map_w, "height": map_h, "seeds": {}}
+    return manifest
+
+def save_manifest(path, manifest):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+def manifest_seed_done(manifest, seed, key):
+    entry = manifest["seeds"].get(str(seed))
+    return entry is not None and entry["ok"] and entry.get("key") == key and map_exports_ok(seed)
+
 def parse_args():
     p = argparse.ArgumentParser(description="Generate P1 map exports for a seed interval.")
     p.add_argument("--start", type=int, default=SEED_START_DEF, help="first seed (default %d)" % SEED_START_DEF)
@@ -69,6 +108,10 @@ def parse_args():
     p.add_argument("--width", type=int, default=MAP_W_DEF, help="map width (default %d)" % MAP_W_DEF)
     p.add_argument("--height", type=int, default=MAP_H_DEF, help="map height (default %d)" % MAP_H_DEF)
     p.add_argument("--skip-existing", action="store_true", help="skip seeds with all three exports present")
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes (default: cpu count)")
+    p.add_argument("--manifest", default=MANIFEST_DEF, help="progress manifest (default %s)" % MANIFEST_DEF)
+    p.add_argument("--resume", action="store_true", help="skip seeds the manifest records as generated by this tester build")
+    p.add_argument("--no-cache", action="store_true", help="always run the tester instead of reusing cached exports")
     return p.parse_args()
 
 def main():
@@ -85,26 +128,41 @@ def main():
     if not ok:
         print("FAILED compile: %s" % msg)
         return 1
+    bin_hash = tester_hash(os.path.join(ROOT, "%s_tester" % MAKE_MAP_MOD))
+    use_cache = not args.no_cache
     seeds = list(range(args.start, args.end + 1))
-    print("generating maps for seeds %d..%d -> %s/p1-seed-*/{terrain,climate,rivers,overlay}.ppm" % (args.start, args.end, OUT_ROOT))
+    manifest = load_manifest(args.manifest, args.width, args.height)
+    print("generating maps for seeds %d..%d on %d worker(s) -> %s/p1-seed-*/{terrain,climate,rivers,overlay}.ppm"
+          % (args.start, args.end, args.jobs, OUT_ROOT))
     failed = []
     skipped = 0
+    cached = 0
+    todo = []
     for seed in seeds:
-        if args.skip_existing and map_exports_ok(seed):
+        if args.resume and manifest_seed_done(manifest, seed, map_cache_key(seed, args.width, args.height, bin_hash, "subdir")):
+            skipped += 1
+        elif args.skip_existing and map_exports_ok(seed):
             skipped += 1
-            continue
-        print("--- seed %d ---" % seed)
-        ok, msg = run_make_map(seed, args.width, args.height)
-        if ok:
-            if msg:
-                for line in msg.splitlines():
-                    if line.startswith("saved:") and line.endswith(".ppm"):
-                        print(line)
         else:
-            print("FAILED seed %d: %s" % (seed, msg))
-            failed.append(seed)
-    done = len(seeds) - len(failed) - skipped
-    print("done: %d generated, %d skipped, %d failed" % (done, skipped, len(failed)))
+            todo.append(seed)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = [pool.submit(run_seed_job, seed, args.width, args.height, bin_hash, use_cache) for seed in todo]
+        for n, future in enumerate(as_completed(futures), 1):
+            seed, key, ok, hit, msg, sec = future.result()
+            cached += 1 if hit else 0
+            manifest["seeds"][str(seed)] = {"ok": ok, "key": key, "sec": round(sec, 3), "msg": "" if ok else msg}
+            save_manifest(args.manifest, manifest)
+            elapsed = time.perf_counter() - start
+            eta = elapsed / n * (len(todo) - n)
+            if ok:
+                print("[%d/%d] seed %d %s (%.1fs, eta %.0fs)" % (n, len(todo), seed, "cached" if hit else "ok", sec, eta), flush=True)
+            else:
+                print("[%d/%d] FAILED seed %d: %s" % (n, len(todo), seed, msg), flush=True)
+                failed.append(seed)
+    failed.sort()
+    done = len(seeds) - len(failed) - skipped - cached
+    print("done: %d generated, %d from cache, %d skipped, %d failed" % (done, cached, skipped, len(failed)))
     if failed:
         print("failed seeds: %s" % ", ".join(str(s) for s in failed))
         return 1
@@ -13,7 +13,8 @@ sys.dont_write_bytecode = True
 ROOT = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, ROOT)
 
-from p1_tester_driver import run_tester
+from p1_map_cache import cache_restore, cache_store, map_cache_key, tester_hash
+from p1_tester_driver import BATCH_KINDS, MAP_H_DEF, MAP_W_DEF, batch_export_path, run_tester
 
 #================================================================================================================================#
 #=> - Constants -
@@ -51,6 +52,17 @@ def _compile_make_map():
         return False, msg
     return True, ""
 
+def _make_seed(seed, bin_hash):
+    key = map_cache_key(seed, MAP_W_DEF, MAP_H_DEF, bin_hash, "batch")
+    paths = {k: batch_export_path(seed, k) for k in BATCH_KINDS}
+    if cache_restore(key, paths):
+        return True, "cached"
+    ok, msg = run_tester(TESTER_MOD, OUT_IMAGE, seed=seed, batch=True)
+    if ok:
+        cache_store(key, paths)
+        msg = "ok"
+    return ok, msg
+
 def main():
     rng, err = _parse_seed_range(sys.argv)
     if err is not None:
@@ -61,14 +73,15 @@ def main():
     if not ok:
         print("FAILED compile: %s" % msg)
         return 1
+    bin_hash = tester_hash(os.path.join(ROOT, "%s_tester" % TESTER_MOD))
     failed = []
     ok_n = 0
     total = hi - lo + 1
     for seed in range(lo, hi + 1):
-        ok, msg = run_tester(TESTER_MOD, OUT_IMAGE, seed=seed, batch=True)
+        ok, msg = _make_seed(seed, bin_hash)
         if ok:
             ok_n += 1
-            print("seed %u: ok" % seed, flush=True)
+            print("seed %u: %s" % (seed, msg), flush=True)
         else:
             print("seed %u: FAILED: %s" % (seed, msg), flush=True)
             failed.append(seed)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+#================================================================================================================================#
+#=> - Imports -
+#================================================================================================================================#
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+
+sys.dont_write_bytecode = True
+
+#================================================================================================================================#
+#=> - Constants -
+#================================================================================================================================#
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+OUT_ROOT = "/home/w/Projects/simple-map-gen"
+CACHE_ROOT = os.path.join(OUT_ROOT, "cache")
+MAP_CONFIG_H = os.path.join(ROOT, "map_config.h")
+STATICS_LIB = os.path.join(ROOT, "..", "data_io", "runtime_static_loader_lib.so")
+MAP_TYPE_DEF = "continental"
+CFG_LINE_RE = re.compile(r"^\s*c\.(m_\w+)\s*=\s*([-0-9.]+)[uf]?\s*;")
+
+#================================================================================================================================#
+#=> - Functions -
+#================================================================================================================================#
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def tester_hash(exe_path):
+    # The tester dlopens the statics loader, so its bytes are part of what produced a map.
+    parts = [file_sha256(exe_path)]
+    if os.path.isfile(STATICS_LIB):
+        parts.append(file_sha256(STATICS_LIB))
+    return hashlib.sha256("|".join(parts).encode("ascii")).hexdigest()
+
+def map_config_values(path=MAP_CONFIG_H):
+    # Values from map_config_def(); the testers always generate with the defaults.
+    vals = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            mt = CFG_LINE_RE.match(line)
+            if mt:
+                vals[mt.group(1)] = mt.group(2)
+    return vals
+
+def map_cache_key(seed, map_w, map_h, bin_hash, layout, map_type=MAP_TYPE_DEF, cfg=None):
+    # layout separates export flavours of one tester (per-seed subdir vs batch) that share a seed.
+    if cfg is None:
+        cfg = map_config_values()
+    desc = {"seed": seed, "w": map_w, "h": map_h, "type": map_type, "cfg": cfg, "bin": bin_hash, "layout": layout}
+    return hashlib.sha256(json.dumps(desc, sort_keys=True).encode("utf-8")).hexdigest()
+
+def cache_entry_dir(key):
+    return os.path.join(CACHE_ROOT, key[:2], key)
+
+def cache_has(key, kinds):
+    d = cache_entry_dir(key)
+    return all(os.path.isfile(os.path.join(d, "%s.ppm" % k)) for k in kinds)
+
+def cache_restore(key, dst_paths):
+    """Copy cached exports to dst_paths ({kind: path}); False on any miss."""
+    if not cache_has(key, dst_paths.keys()):
+        return False
+    d = cache_entry_dir(key)
+    for kind, dst in dst_paths.items():
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        shutil.copyfile(os.path.join(d, "%s.ppm" % kind), dst)
+    return True
+
+def cache_store(key, src_paths):
+    """Publish {kind: path} exports under key; each file appears atomically, so parallel writers are safe."""
+    d = cache_entry_dir(key)
+    os.makedirs(d, exist_ok=True)
+    for kind, src in src_paths.items():
+        dst = os.path.join(d, "%s.ppm" % kind)
+        if os.path.isfile(dst):
+            continue
+        tmp = "%s.tmp-%d" % (dst, os.getpid())
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+
+#================================================================================================================================#
+#=> - End -
+#================================================================================================================================#
@@ -4,9 +4,13 @@
 #=> - Imports -
 #================================================================================================================================#
 
+import argparse
+import json
 import os
 import subprocess
 import sys
+import tempfile
+import time
 
 sys.dont_write_bytecode = True
 
@@ -61,34 +65,92 @@ TESTERS = [
 #=> - Functions -
 #================================================================================================================================#
 
+def _run_measured(args):
+    # os.wait4 gives the child's own rusage (incl. its reaped children, e.g. g++ under bash).
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        start = time.perf_counter()
+        proc = subprocess.Popen(args, cwd=ROOT, stdout=out, stderr=err)
+        _, status, ru = os.wait4(proc.pid, 0)
+        sec = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        out.seek(0)
+        err.seek(0)
+        stdout = out.read().decode("utf-8", errors="replace")
+        stderr = err.read().decode("utf-8", errors="replace")
+    return proc.returncode, stdout, stderr, sec, ru.ru_maxrss
+
 def _run_one(mod):
     comp = os.path.join(ROOT, "%s_comp" % mod)
     exe = os.path.join(ROOT, "%s_tester" % mod)
+    stats = {"comp_sec": 0.0, "comp_rss_kb": 0, "run_sec": 0.0, "run_rss_kb": 0}
     if not os.path.isfile(comp):
-        return False, "missing comp: %s" % comp
-    proc = subprocess.run(["bash", comp], cwd=ROOT, capture_output=True, text=True)
-    if proc.returncode != 0:
-        msg = proc.stderr.strip() or proc.stdout.strip() or "compile failed"
-        return False, msg
-    proc = subprocess.run([exe], cwd=ROOT, capture_output=True, text=True)
-    if proc.returncode != 0:
-        msg = proc.stderr.strip() or proc.stdout.strip() or "tester failed"
-        return False, msg
-    return True, proc.stdout.strip()
+        return False, "missing comp: %s" % comp, stats
+    code, stdout, stderr, stats["comp_sec"], stats["comp_rss_kb"] = _run_measured(["bash", comp])
+    if code != 0:
+        msg = stderr.strip() or stdout.strip() or "compile failed"
+        return False, msg, stats
+    code, stdout, stderr, stats["run_sec"], stats["run_rss_kb"] = _run_measured([exe])
+    if code != 0:
+        msg = stderr.strip() or stdout.strip() or "tester failed"
+        return False, msg, stats
+    return True, stdout.strip(), stats
+
+def _fmt_delta(cur, base):
+    if base is None:
+        return "       -"
+    if base <= 0:
+        return "     new"
+    return "%+7.0f%%" % (100.0 * (cur - base) / base)
+
+def print_timing_table(timings, baseline=None):
+    baseline = baseline or {}
+    rows = sorted(timings.items(), key=lambda kv: kv[1]["comp_sec"] + kv[1]["run_sec"], reverse=True)
+    hdr = "%-38s %9s %9s %10s %10s" % ("stage", "comp s", "run s", "comp MB", "run MB")
+    if baseline:
+        hdr += " %8s %8s" % ("d comp", "d run")
+    print(hdr)
+    print("-" * len(hdr))
+    for mod, t in rows:
+        line = "%-38s %9.2f %9.2f %10.1f %10.1f" % (mod, t["comp_sec"], t["run_sec"],
+                                                   t["comp_rss_kb"] / 1024.0, t["run_rss_kb"] / 1024.0)
+        if baseline:
+            b = baseline.get(mod, {})
+            line += " %8s %8s" % (_fmt_delta(t["comp_sec"], b.get("comp_sec")), _fmt_delta(t["run_sec"], b.get("run_sec")))
+        print(line)
+    tot_comp = sum(t["comp_sec"] for t in timings.values())
+    tot_run = sum(t["run_sec"] for t in timings.values())
+    print("%-38s %9.2f %9.2f" % ("total", tot_comp, tot_run))
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Compile and run every p1 pipeline tester with per-stage timing.")
+    p.add_argument("--baseline", help="compare stage timings against a JSON file written by --save-baseline")
+    p.add_argument("--save-baseline", help="write this run's stage timings as JSON")
+    return p.parse_args()
 
 def main():
+    args = parse_args()
     seed = read_seed_file()
     print("running %d p1 testers with seed %d (subdir output)" % (len(TESTERS), seed))
     failed = []
+    timings = {}
     for mod in TESTERS:
         print("--- %s ---" % mod)
-        ok, msg = _run_one(mod)
+        ok, msg, timings[mod] = _run_one(mod)
         if ok:
             if msg:
                 print(msg)
         else:
             print("FAILED: %s" % msg)
             failed.append(mod)
+    print("")
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["stages"]
+    print_timing_table(timings, baseline)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"seed": seed, "stages": timings}, f, indent=1, sort_keys=True)
     if failed:
         print("failed (%d): %s" % (len(failed), ", ".join(failed)))
         return 1
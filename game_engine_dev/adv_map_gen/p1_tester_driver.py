@@ -12,6 +12,9 @@ from tkinter import ttk
 
 sys.dont_write_bytecode = True
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "misc"))
+from pnm_io import pnm_bytes, read_pnm
+
 #================================================================================================================================#
 #=> - Constants -
 #================================================================================================================================#
@@ -161,19 +164,19 @@ class P1StepViewerApp(object):
             m.m_status.config(text=msg)
             return
         try:
-            m.m_photo = tk.PhotoImage(file=msg)
-            w = m.m_photo.width()
-            h = m.m_photo.height()
+            img = read_pnm(msg)
+            h, w = img.shape[:2]
             scale = 1
             while w // scale > 800 or h // scale > 800:
                 scale += 1
             if scale > 1:
-                m.m_photo = m.m_photo.subsample(scale, scale)
+                img = img[::scale, ::scale]
+            m.m_photo = tk.PhotoImage(data=pnm_bytes(img), format="PPM")
             m.m_cvs.delete("all")
             m.m_cvs.config(width=m.m_photo.width(), height=m.m_photo.height())
             m.m_cvs.create_image(0, 0, image=m.m_photo, anchor=tk.NW)
             m.m_status.config(text=msg)
-        except tk.TclError as exc:
+        except (tk.TclError, ValueError, OSError) as exc:
             m.m_cvs.delete("all")
             m.m_status.config(text="display failed: %s" % exc)
 
@@ -5,8 +5,15 @@
 import sys
 sys.dont_write_bytecode = True
 
+import argparse
 import os
 
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "misc"))
+from pnm_io import read_pnm, write_pnm
+from explore_trace import PLAYER_N, ExploreTrace
+
 #================================================================================================================================#
 #=> - Constants -
 #================================================================================================================================#
@@ -20,112 +27,140 @@ TRACE_PATH = os.path.join(THIS_DIR, "explore_distant_test.trace")
 OUT_DIR = "/home/w/Projects/simple-map-gen/explore-distant-test"
 
 UNEXPLORED = (24, 24, 32)
-PLAYER_N = 2
+EXPORT_FMTS = ("ppm", "y4m", "gif")
+FPS_DEF = 10
 
 #================================================================================================================================#
 #=> - PPM -
 #================================================================================================================================#
 
-def ppm_read_token (f):
-    tok = b""
-    while True:
-        c = f.read(1)
-        if not c:
-            break
-        if c in b" \t\r\n":
-            if tok:
-                break
-            if c == b"#":
-                while c not in (b"\n", b""):
-                    c = f.read(1)
-            continue
-        if c == b"#":
-            while c not in (b"\n", b""):
-                c = f.read(1)
-            continue
-        tok += c
-    if not tok:
-        return None
-    return tok.decode("ascii")
-
 def load_ppm_rgb (path):
-    with open(path, "rb") as f:
-        if f.read(2) != b"P6":
-            raise ValueError("not P6 ppm: " + path)
-        w = int(ppm_read_token(f))
-        h = int(ppm_read_token(f))
-        maxv = int(ppm_read_token(f))
-        if maxv != 255:
-            raise ValueError("expected maxval 255: " + path)
-        raw = f.read(w * h * 3)
-        if len(raw) != w * h * 3:
-            raise ValueError("short ppm body: " + path)
-    return w, h, raw
+    rgb = read_pnm(path)
+    if rgb.ndim != 3 or rgb.dtype != np.uint8:
+        raise ValueError("expected 8-bit P6 ppm: " + path)
+    return rgb.shape[1], rgb.shape[0], rgb.tobytes()
 
 def write_ppm_rgb (path, w, h, rgb):
-    with open(path, "wb") as f:
-        f.write(b"P6\n")
-        f.write(("%d %d\n" % (w, h)).encode("ascii"))
-        f.write(b"255\n")
-        f.write(rgb)
-
-#================================================================================================================================#
-#=> - Trace -
-#================================================================================================================================#
-
-def parse_trace (path):
-    explored = {0: set(), 1: set()}
-    snapshots = []
-    with open(path, "r", encoding="utf-8") as ptr:
-        for line in ptr:
-            line = line.strip()
-            if line == "":
-                continue
-            if line.startswith("EXPLORE_DISCOVER:"):
-                parts = line.split(":")
-                if len(parts) != 4:
-                    continue
-                x = int(parts[1])
-                y = int(parts[2])
-                p = int(parts[3])
-                explored[p].add((x, y))
-            elif line.startswith("NEW_TURN:"):
-                snapshots.append({0: set(explored[0]), 1: set(explored[1])})
-    snapshots.append({0: set(explored[0]), 1: set(explored[1])})
-    if len(snapshots) == 0:
-        snapshots.append({0: set(), 1: set()})
-    return snapshots
+    write_pnm(path, np.frombuffer(rgb, dtype=np.uint8).reshape(h, w, 3))
 
 #================================================================================================================================#
 #=> - Compose -
 #================================================================================================================================#
 
 def compose_player_frame (base_rgb, explored):
-    out = bytearray(len(base_rgb))
-    for y in range(MAP_H):
-        for x in range(MAP_W):
-            i = (y * MAP_W + x) * 3
-            if (x, y) not in explored:
-                out[i] = UNEXPLORED[0]
-                out[i + 1] = UNEXPLORED[1]
-                out[i + 2] = UNEXPLORED[2]
-                continue
-            out[i] = base_rgb[i]
-            out[i + 1] = base_rgb[i + 1]
-            out[i + 2] = base_rgb[i + 2]
-    return bytes(out)
+    base = np.frombuffer(base_rgb, dtype=np.uint8).reshape(-1, 3)
+    out = np.empty_like(base)
+    out[:] = UNEXPLORED
+    out[explored] = base[explored]
+    return out.tobytes()
+
+#================================================================================================================================#
+#=> - Streams -
+#================================================================================================================================#
+
+def rgb_to_yuv444 (rgb):
+    # BT.601 limited range, integer form.
+    r = rgb[..., 0].astype(np.int32)
+    g = rgb[..., 1].astype(np.int32)
+    b = rgb[..., 2].astype(np.int32)
+    y = ((66 * r + 129 * g + 25 * b + 128) >> 8) + 16
+    u = ((-38 * r - 74 * g + 112 * b + 128) >> 8) + 128
+    v = ((112 * r - 94 * g - 18 * b + 128) >> 8) + 128
+    return [c.astype(np.uint8).ravel() for c in (y, u, v)]
+
+class Y4MStream:
+    """Uncompressed YUV4MPEG2 (4:4:4) stream; one frame is converted and written per write()."""
+
+    def __init__ (m, path, base_rgb, fps):
+        h, w = base_rgb.shape[:2]
+        m.base = rgb_to_yuv444(base_rgb)
+        m.hidden = rgb_to_yuv444(np.array([[UNEXPLORED]], dtype=np.uint8))
+        m.f = open(path, "wb")
+        m.f.write(("YUV4MPEG2 W%d H%d F%d:1 Ip A1:1 C444 XCOLORRANGE=LIMITED\n" % (w, h, fps)).encode("ascii"))
+
+    def write (m, explored):
+        m.f.write(b"FRAME\n")
+        for plane, hidden in zip(m.base, m.hidden):
+            np.where(explored, plane, hidden[0]).tofile(m.f)
+
+    def close (m):
+        m.f.close()
+
+class GifStream:
+    """Animated GIF written frame by frame through PIL's GIF chunk helpers (no frame list is kept)."""
+
+    def __init__ (m, path, base_rgb, fps):
+        from PIL import GifImagePlugin, Image
+        m.Image = Image
+        m.GifImagePlugin = GifImagePlugin
+        m.duration = max(1, int(round(1000.0 / fps)))
+        base_idx, pal = m.index_base(base_rgb)
+        m.base_idx = base_idx.ravel()
+        m.hidden_idx = 255
+        pal[m.hidden_idx] = UNEXPLORED
+        m.shape = base_rgb.shape[:2]
+        m.pal = pal.tobytes()
+        m.f = open(path, "wb")
+        hdr, _ = GifImagePlugin.getheader(m.mk_frame(np.zeros(m.base_idx.shape, dtype=np.bool_)), m.pal, {"loop": 0})
+        for chunk in hdr:
+            m.f.write(chunk)
+
+    def index_base (m, base_rgb):
+        # Exact palette when the map has <= 255 colours, PIL median-cut otherwise; index 255 is unexplored.
+        packed = (base_rgb[..., 0].astype(np.uint32) << 16) | (base_rgb[..., 1].astype(np.uint32) << 8) | base_rgb[..., 2]
+        cols, inv = np.unique(packed.ravel(), return_inverse=True)
+        pal = np.zeros((256, 3), dtype=np.uint8)
+        if cols.size <= 255:
+            pal[:cols.size, 0] = cols >> 16
+            pal[:cols.size, 1] = (cols >> 8) & 0xFF
+            pal[:cols.size, 2] = cols & 0xFF
+            return inv.astype(np.uint8).reshape(base_rgb.shape[:2]), pal
+        q = m.Image.fromarray(base_rgb, "RGB").quantize(255)
+        q_pal = np.frombuffer(bytes(q.getpalette()[:255 * 3]), dtype=np.uint8).reshape(-1, 3)
+        pal[:q_pal.shape[0]] = q_pal
+        return np.asarray(q, dtype=np.uint8), pal
+
+    def mk_frame (m, explored):
+        idx = np.where(explored, m.base_idx, m.hidden_idx).astype(np.uint8).reshape(m.shape)
+        im = m.Image.fromarray(idx, "P")
+        im.putpalette(m.pal)
+        return im
+
+    def write (m, explored):
+        for chunk in m.GifImagePlugin.getdata(m.mk_frame(explored), (0, 0), duration=m.duration):
+            m.f.write(chunk)
+
+    def close (m):
+        m.f.write(b";")
+        m.f.close()
+
+STREAMS = {"y4m": Y4MStream, "gif": GifStream}
 
 #================================================================================================================================#
 #=> - Export -
 #================================================================================================================================#
 
-def export_turn_images (terr_rgb, snapshots, out_dir):
+def export_turn_stream (terr_rgb, trace, out_dir, fmt, fps=FPS_DEF):
+    os.makedirs(out_dir, exist_ok=True)
+    base = np.frombuffer(terr_rgb, dtype=np.uint8).reshape(MAP_H, MAP_W, 3)
+    for player in range(PLAYER_N):
+        path = os.path.join(out_dir, "%03d_explore.%s" % (player, fmt))
+        stream = STREAMS[fmt](path, base, fps)
+        try:
+            for explored in trace.iter_explored(player):
+                stream.write(explored)
+        finally:
+            stream.close()
+    return PLAYER_N
+
+def export_turn_images (terr_rgb, trace, out_dir, fmt="ppm", fps=FPS_DEF):
+    if fmt != "ppm":
+        return export_turn_stream(terr_rgb, trace, out_dir, fmt, fps)
     os.makedirs(out_dir, exist_ok=True)
-    turn_n = len(snapshots)
     file_n = 0
     for player in range(PLAYER_N):
-        for turn in range(turn_n):
-            frame = compose_player_frame(terr_rgb, snapshots[turn][player])
+        for turn, explored in enumerate(trace.iter_explored(player)):
+            frame = compose_player_frame(terr_rgb, explored)
             name = "%03d_%04d_explore.ppm" % (player, turn)
             path = os.path.join(out_dir, name)
             write_ppm_rgb(path, MAP_W, MAP_H, frame)
@@ -136,7 +171,14 @@ def export_turn_images (terr_rgb, snapshots, out_dir):
 #=> - Main -
 #================================================================================================================================#
 
+def parse_args ():
+    p = argparse.ArgumentParser(description="Export per-player exploration frames from the explore_distant trace.")
+    p.add_argument("--format", choices=EXPORT_FMTS, default="ppm", help="ppm: one file per player per turn; y4m/gif: one stream per player")
+    p.add_argument("--fps", type=int, default=FPS_DEF, help="stream frame rate (default %d)" % FPS_DEF)
+    return p.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
     os.chdir(THIS_DIR)
     if not os.path.isfile(TRACE_PATH):
         print("WARN: missing", TRACE_PATH)
@@ -148,9 +190,9 @@ if __name__ == "__main__":
     if w != MAP_W or h != MAP_H:
         print("WARN: terrain size %dx%d" % (w, h))
         sys.exit(1)
-    snapshots = parse_trace(TRACE_PATH)
-    n = export_turn_images(terr_rgb, snapshots, OUT_DIR)
-    print("OK: wrote %d images (%d players) to %s" % (n, PLAYER_N, OUT_DIR))
+    trace = ExploreTrace(TRACE_PATH)
+    n = export_turn_images(terr_rgb, trace, OUT_DIR, args.format, args.fps)
+    print("OK: wrote %d %s file(s) (%d players) to %s" % (n, args.format, PLAYER_N, OUT_DIR))
 
 #================================================================================================================================#
 #=> - End -
@@ -9,6 +9,12 @@ import os
 import tkinter as tk
 from tkinter import ttk
 
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "misc"))
+from pnm_io import read_pnm
+from explore_trace import ExploreTrace
+
 #================================================================================================================================#
 #=> - Constants -
 #================================================================================================================================#
@@ -35,126 +41,41 @@ BOTH_TINT = (200, 180, 40)
 #=> - PPM -
 #================================================================================================================================#
 
-def ppm_read_token (f):
-    tok = b""
-    while True:
-        c = f.read(1)
-        if not c:
-            break
-        if c in b" \t\r\n":
-            if tok:
-                break
-            if c == b"#":
-                while c not in (b"\n", b""):
-                    c = f.read(1)
-            continue
-        if c == b"#":
-            while c not in (b"\n", b""):
-                c = f.read(1)
-            continue
-        tok += c
-    if not tok:
-        return None
-    return tok.decode("ascii")
-
 def load_ppm_rgb (path):
-    with open(path, "rb") as f:
-        if f.read(2) != b"P6":
-            raise ValueError("not P6 ppm: " + path)
-        w = int(ppm_read_token(f))
-        h = int(ppm_read_token(f))
-        maxv = int(ppm_read_token(f))
-        if maxv != 255:
-            raise ValueError("expected maxval 255: " + path)
-        raw = f.read(w * h * 3)
-        if len(raw) != w * h * 3:
-            raise ValueError("short ppm body: " + path)
-    return w, h, raw
+    rgb = read_pnm(path)
+    if rgb.ndim != 3 or rgb.dtype != np.uint8:
+        raise ValueError("expected 8-bit P6 ppm: " + path)
+    return rgb.shape[1], rgb.shape[0], rgb.tobytes()
 
 def rgb_view_ppm (w, h, rgb):
     return b"P6\n" + ("%d %d\n" % (w, h)).encode("ascii") + b"255\n" + rgb
 
-#================================================================================================================================#
-#=> - Trace -
-#================================================================================================================================#
-
-def parse_trace (path):
-    explored = {0: set(), 1: set()}
-    snapshots = []
-    with open(path, "r", encoding="utf-8") as ptr:
-        for line in ptr:
-            line = line.strip()
-            if line == "":
-                continue
-            if line.startswith("EXPLORE_DISCOVER:"):
-                parts = line.split(":")
-                if len(parts) != 4:
-                    continue
-                x = int(parts[1])
-                y = int(parts[2])
-                p = int(parts[3])
-                explored[p].add((x, y))
-            elif line.startswith("NEW_TURN:"):
-                snapshots.append({0: set(explored[0]), 1: set(explored[1])})
-    snapshots.append({0: set(explored[0]), 1: set(explored[1])})
-    if len(snapshots) == 0:
-        snapshots.append({0: set(), 1: set()})
-    return snapshots
-
 #================================================================================================================================#
 #=> - Compose -
 #================================================================================================================================#
 
 def blend_px (base, tint, alpha):
-    br, bg, bb = base
-    tr, tg, tb = tint
+    # base: (n, 3) uint8; same float64 expression and truncation as the old per-pixel blend.
     a = alpha / 255.0
-    return (
-        int(br * (1.0 - a) + tr * a),
-        int(bg * (1.0 - a) + tg * a),
-        int(bb * (1.0 - a) + tb * a),
-    )
+    return (base * (1.0 - a) + np.array(tint, dtype=np.float64) * a).astype(np.uint8)
 
 def compose_frame (base_rgb, exp0, exp1):
-    out = bytearray(len(base_rgb))
-    for y in range(MAP_H):
-        for x in range(MAP_W):
-            i = (y * MAP_W + x) * 3
-            in0 = (x, y) in exp0
-            in1 = (x, y) in exp1
-            if not in0 and not in1:
-                out[i] = UNEXPLORED[0]
-                out[i + 1] = UNEXPLORED[1]
-                out[i + 2] = UNEXPLORED[2]
-                continue
-            r, g, b = base_rgb[i], base_rgb[i + 1], base_rgb[i + 2]
-            if in0 and in1:
-                r, g, b = blend_px((r, g, b), BOTH_TINT, 72)
-            elif in0:
-                r, g, b = blend_px((r, g, b), P0_TINT, 96)
-            else:
-                r, g, b = blend_px((r, g, b), P1_TINT, 96)
-            out[i] = r
-            out[i + 1] = g
-            out[i + 2] = b
-    return bytes(out)
+    base = np.frombuffer(base_rgb, dtype=np.uint8).reshape(-1, 3)
+    out = np.empty_like(base)
+    out[:] = UNEXPLORED
+    both = exp0 & exp1
+    only0 = exp0 & ~exp1
+    only1 = exp1 & ~exp0
+    out[both] = blend_px(base[both], BOTH_TINT, 72)
+    out[only0] = blend_px(base[only0], P0_TINT, 96)
+    out[only1] = blend_px(base[only1], P1_TINT, 96)
+    return out.tobytes()
 
 def scale_rgb (rgb, sw, sh, dw, dh):
-    out = bytearray(dw * dh * 3)
-    for dy in range(dh):
-        sy = int(dy * sh / dh)
-        if sy >= sh:
-            sy = sh - 1
-        for dx in range(dw):
-            sx = int(dx * sw / dw)
-            if sx >= sw:
-                sx = sw - 1
-            si = (sy * sw + sx) * 3
-            di = (dy * dw + dx) * 3
-            out[di] = rgb[si]
-            out[di + 1] = rgb[si + 1]
-            out[di + 2] = rgb[si + 2]
-    return bytes(out)
+    sy = np.minimum((np.arange(dh) * sh / dh).astype(np.int64), sh - 1)
+    sx = np.minimum((np.arange(dw) * sw / dw).astype(np.int64), sw - 1)
+    src = np.frombuffer(rgb, dtype=np.uint8).reshape(sh, sw, 3)
+    return src[sy[:, None], sx[None, :]].tobytes()
 
 #================================================================================================================================#
 #=> - ExploreDistantValid -
@@ -170,8 +91,8 @@ class ExploreDistantValid:
             if w != MAP_W or h != MAP_H:
                 raise ValueError("%s map size %dx%d" % (name, w, h))
             m.maps[name] = rgb
-        m.snapshots = parse_trace(TRACE_PATH)
-        m.max_turn = max(0, len(m.snapshots) - 1)
+        m.trace = ExploreTrace(TRACE_PATH)
+        m.max_turn = max(0, m.trace.turn_n - 1)
         m.map_idx = 0
         m.speed_idx = 1
         m.turn = 0
@@ -297,15 +218,17 @@ class ExploreDistantValid:
         key = (MAP_NAMES[m.map_idx], turn)
         if key not in m.frame_cache:
             base = m.maps[MAP_NAMES[m.map_idx]]
-            exp = m.snapshots[min(turn, len(m.snapshots) - 1)]
-            m.frame_cache[key] = compose_frame(base, exp[0], exp[1])
+            turn = min(turn, m.max_turn)
+            m.frame_cache[key] = compose_frame(base, m.trace.explored(turn, 0), m.trace.explored(turn, 1))
         return m.frame_cache[key]
 
     def render (m):
         turn = m.turn
-        exp = m.snapshots[min(turn, len(m.snapshots) - 1)]
+        cnt = m.trace.counts
+        c0 = cnt[0][min(turn, len(cnt[0]) - 1)]
+        c1 = cnt[1][min(turn, len(cnt[1]) - 1)]
         m.stat_lbl.config(
-            text="p0=%d p1=%d zoom=%.2fx" % (len(exp[0]), len(exp[1]), m.px_per_tile)
+            text="p0=%d p1=%d zoom=%.2fx" % (c0, c1, m.px_per_tile)
         )
         full = m.frame_rgb(turn)
         tiles_w = CANVAS_W / m.px_per_tile
@@ -0,0 +1,82 @@
+#================================================================================================================================#
+#=> - Imports -
+#================================================================================================================================#
+
+import sys
+sys.dont_write_bytecode = True
+
+import numpy as np
+
+#================================================================================================================================#
+#=> - Constants -
+#================================================================================================================================#
+
+MAP_W = 1000
+MAP_H = 1000
+PLAYER_N = 2
+KEYFRAME_EVERY = 32
+
+#================================================================================================================================#
+#=> - Trace -
+#================================================================================================================================#
+
+class ExploreTrace:
+    """Per-player turn deltas of newly explored tile indices, with a full mask every KEYFRAME_EVERY turns."""
+
+    def __init__ (m, path, w=MAP_W, h=MAP_H, player_n=PLAYER_N, key_every=KEYFRAME_EVERY):
+        m.w = w
+        m.h = h
+        m.player_n = player_n
+        m.key_every = key_every
+        m.deltas = [[] for _ in range(player_n)]
+        m.keyframes = [[] for _ in range(player_n)]
+        m.counts = [[] for _ in range(player_n)]
+        seen = [bytearray(w * h) for _ in range(player_n)]
+        cur = [[] for _ in range(player_n)]
+        with open(path, "r", encoding="utf-8") as ptr:
+            for line in ptr:
+                line = line.strip()
+                if line == "":
+                    continue
+                if line.startswith("EXPLORE_DISCOVER:"):
+                    parts = line.split(":")
+                    if len(parts) != 4:
+                        continue
+                    i = int(parts[2]) * w + int(parts[1])
+                    p = int(parts[3])
+                    if not seen[p][i]:
+                        seen[p][i] = 1
+                        cur[p].append(i)
+                elif line.startswith("NEW_TURN:"):
+                    m.close_turn(cur, seen)
+        m.close_turn(cur, seen)
+        m.turn_n = len(m.deltas[0])
+
+    def close_turn (m, cur, seen):
+        for p in range(m.player_n):
+            turn = len(m.deltas[p])
+            m.deltas[p].append(np.array(cur[p], dtype=np.int32))
+            prev = m.counts[p][-1] if turn > 0 else 0
+            m.counts[p].append(prev + len(cur[p]))
+            if turn % m.key_every == 0:
+                m.keyframes[p].append(np.frombuffer(bytes(seen[p]), dtype=np.bool_))
+            cur[p].clear()
+
+    def explored (m, turn, player):
+        """Flat bool mask of tiles explored by player as of the end of turn."""
+        k = turn // m.key_every
+        mask = m.keyframes[player][k].copy()
+        for t in range(k * m.key_every + 1, turn + 1):
+            mask[m.deltas[player][t]] = True
+        return mask
+
+    def iter_explored (m, player):
+        """Yield the same mask object updated in place turn by turn (no per-turn copies)."""
+        mask = np.zeros(m.w * m.h, dtype=np.bool_)
+        for d in m.deltas[player]:
+            mask[d] = True
+            yield mask
+
+#================================================================================================================================#
+#=> - End -
+#================================================================================================================================#
@@ -8,8 +8,13 @@ import random
 import sys
 import time
 
+import numpy as np
+
 sys.dont_write_bytecode = True
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "misc"))
+from pnm_io import read_pnm, write_pnm
+
 #================================================================================================================================#
 #=> - Config -
 #================================================================================================================================#
@@ -37,6 +42,7 @@ TERR_ROWS = [
 TERR_OCEAN = 1
 TERR_SEA = 2
 TERR_COASTAL = 3
+TERR_NONE = 255
 TERR_PLAINS = 4
 TERR_HILLS = 5
 WATER_SET = {TERR_OCEAN, TERR_SEA, TERR_COASTAL}
@@ -102,96 +108,38 @@ def draw_pts(buf, w, h, pts, rad, rgb):
         draw_dot(buf, w, h, x, y, rad, rgb)
 
 def save_ppm(path, buf, w, h):
-    hdr = "P6\n%d %d\n255\n" % (w, h)
-    with open(path, "wb") as ptr:
-        ptr.write(hdr.encode("ascii"))
-        ptr.write(buf)
+    write_pnm(path, np.frombuffer(buf, dtype=np.uint8).reshape(h, w, 3))
 
 def save_gray_ppm(path, gray, w, h):
-    buf = bytearray(w * h * 3)
-    for i, g in enumerate(gray):
-        j = i * 3
-        buf[j] = g
-        buf[j + 1] = g
-        buf[j + 2] = g
-    save_ppm(path, buf, w, h)
+    g = np.asarray(gray, dtype=np.uint8).reshape(h, w)
+    write_pnm(path, np.repeat(g[:, :, None], 3, axis=2))
 
 #================================================================================================================================#
 #=> - Terrain -
 #================================================================================================================================#
 
-def class_from_rgb(r, g, b):
-    for cls, tr, tg, tb in TERR_ROWS:
-        if tr == r and tg == g and tb == b:
-            return cls
-    return None
+def mk_terr_lut(rows):
+    lut = np.full(1 << 24, TERR_NONE, dtype=np.uint8)
+    for cls, tr, tg, tb in rows:
+        lut[(tr << 16) | (tg << 8) | tb] = cls
+    return lut
+
+def classify_rgb(rgb, lut):
+    packed = (rgb[..., 0].astype(np.uint32) << 16) | (rgb[..., 1].astype(np.uint32) << 8) | rgb[..., 2]
+    return lut[packed]
 
 def load_terrain_ppm(path):
-    with open(path, "rb") as ptr:
-        magic = ptr.read(2)
-        if magic != b"P6":
-            return None
-        line = b""
-        while True:
-            ch = ptr.read(1)
-            if not ch:
-                return None
-            if ch == b"#":
-                while ch and ch != b"\n":
-                    ch = ptr.read(1)
-                continue
-            if ch in b" \t\r\n":
-                continue
-            line = ch
-            break
-        while True:
-            ch = ptr.read(1)
-            if not ch:
-                return None
-            if ch in b" \t\r\n":
-                break
-            line += ch
-        parts = line.decode("ascii").split()
-        while len(parts) < 3:
-            ch = ptr.read(1)
-            if not ch:
-                return None
-            if ch in b" \t\r\n":
-                continue
-            if ch == b"#":
-                while ch and ch != b"\n":
-                    ch = ptr.read(1)
-                continue
-            tok = ch
-            while True:
-                ch = ptr.read(1)
-                if not ch or ch in b" \t\r\n":
-                    break
-                tok += ch
-            parts.append(tok.decode("ascii"))
-        w = int(parts[0])
-        h = int(parts[1])
-        maxv = int(parts[2])
-        if maxv != 255:
-            return None
-        while True:
-            ch = ptr.read(1)
-            if not ch:
-                return None
-            if ch not in b" \t\r\n":
-                ptr.seek(ptr.tell() - 1)
-                break
-        rgb = ptr.read(w * h * 3)
-        if len(rgb) != w * h * 3:
-            return None
-    classes = []
-    for i in range(w * h):
-        j = i * 3
-        cls = class_from_rgb(rgb[j], rgb[j + 1], rgb[j + 2])
-        if cls is None:
-            return None
-        classes.append(cls)
-    return w, h, classes
+    try:
+        rgb = read_pnm(path)
+    except ValueError:
+        return None
+    if rgb.ndim != 3 or rgb.dtype != np.uint8:
+        return None
+    h, w = rgb.shape[:2]
+    cls = classify_rgb(rgb, mk_terr_lut(TERR_ROWS))
+    if (cls == TERR_NONE).any():
+        return None
+    return w, h, cls.ravel().tolist()
 
 def is_water(cls, water_set):
     return cls in water_set
@@ -233,64 +181,35 @@ def save_land_dist_img(path, classes, pts, w, h, rad, land_set, land_rgb, oth_rg
 #=> - Water distance -
 #================================================================================================================================#
 
-def adj_water(w, h, classes, water_set, i):
-    wi = w
-    px = i % wi
-    py = i // wi
-    if px > 0 and is_water(classes[i - 1], water_set):
-        return True
-    if px + 1 < w and is_water(classes[i + 1], water_set):
-        return True
-    if py > 0 and is_water(classes[i - wi], water_set):
-        return True
-    if py + 1 < h and is_water(classes[i + wi], water_set):
-        return True
-    return False
+def adj_water_mask(water):
+    adj = np.zeros_like(water)
+    adj[:, 1:] |= water[:, :-1]
+    adj[:, :-1] |= water[:, 1:]
+    adj[1:, :] |= water[:-1, :]
+    adj[:-1, :] |= water[1:, :]
+    return adj
 
 def bfs_land_dist_to_water(classes, w, h, water_set):
+    # Multi-source BFS one ring at a time; each land tile enters the frontier once.
     n = w * h
-    dist = [U16_INF] * n
-    q = []
-    max_d = 0
-    for i in range(n):
-        if not is_land(classes[i], water_set):
-            continue
-        if not adj_water(w, h, classes, water_set, i):
-            continue
-        dist[i] = 1
-        q.append(i)
-        if max_d < 1:
-            max_d = 1
-    qh = 0
-    while qh < len(q):
-        i = q[qh]
-        qh += 1
-        cur = dist[i]
-        if cur >= U16_INF - 1:
-            continue
-        nxt = cur + 1
-        wi = w
-        px = i % wi
-        py = i // wi
-        nbs = []
-        if px > 0:
-            nbs.append(i - 1)
-        if px + 1 < w:
-            nbs.append(i + 1)
-        if py > 0:
-            nbs.append(i - wi)
-        if py + 1 < h:
-            nbs.append(i + wi)
-        for j in nbs:
-            if not is_land(classes[j], water_set):
-                continue
-            if dist[j] != U16_INF:
-                continue
-            dist[j] = nxt
-            if nxt > max_d:
-                max_d = nxt
-            q.append(j)
-    return dist, max_d
+    water = np.isin(np.asarray(classes, dtype=np.uint8), list(water_set)).reshape(h, w)
+    land = ~water.ravel()
+    dist = np.full(n, U16_INF, dtype=np.uint16)
+    front = np.flatnonzero(land & adj_water_mask(water).ravel())
+    dist[front] = 1
+    max_d = 1 if front.size else 0
+    d = 1
+    while front.size and d < U16_INF - 1:
+        px = front % w
+        nbs = np.concatenate((front[px > 0] - 1, front[px + 1 < w] + 1, front[front >= w] - w, front[front < n - w] + w))
+        nbs = nbs[land[nbs] & (dist[nbs] == U16_INF)]
+        front = np.unique(nbs)
+        if front.size == 0:
+            break
+        d += 1
+        dist[front] = d
+        max_d = d
+    return dist.tolist(), max_d
 
 def flip_norm_land_gray(d, max_d):
     if d <= 0 or d >= U16_INF:
@@ -438,25 +357,76 @@ def part_pts(pts, k):
         segs.append(pts[a:b])
     return segs
 
+def ring_cells(cx, cy, r):
+    if r == 0:
+        yield cx, cy
+        return
+    for gx in range(cx - r, cx + r + 1):
+        yield gx, cy - r
+        yield gx, cy + r
+    for gy in range(cy - r + 1, cy + r):
+        yield cx - r, gy
+        yield cx + r, gy
+
+class PickGrid(object):
+    """Uniform bucket grid over picked points; min_dist_sq equals the brute-force scan exactly."""
+
+    def __init__(m, pts, k):
+        xs = [p[0] for p in pts]
+        ys = [p[1] for p in pts]
+        m.x0 = min(xs)
+        m.y0 = min(ys)
+        span = max(max(xs) - m.x0, max(ys) - m.y0, 1.0)
+        m.cells_n = max(1, int(math.ceil(math.sqrt(k))))
+        m.cs = span / m.cells_n
+        m.cells = {}
+        m.picked = []
+
+    def cell_of(m, pt):
+        cx = min(m.cells_n - 1, int((pt[0] - m.x0) / m.cs))
+        cy = min(m.cells_n - 1, int((pt[1] - m.y0) / m.cs))
+        return cx, cy
+
+    def add(m, pt):
+        m.cells.setdefault(m.cell_of(pt), []).append(pt)
+        m.picked.append(pt)
+
+    def min_dist_sq(m, pt):
+        cx, cy = m.cell_of(pt)
+        best = float("inf")
+        for r in range(m.cells_n + 1):
+            if (2 * r + 1) * (2 * r + 1) >= len(m.picked):
+                return min_dist_sq(pt, m.picked)
+            for cell in ring_cells(cx, cy, r):
+                for q in m.cells.get(cell, ()):
+                    d = dist_sq(pt, q)
+                    if d < best:
+                        best = d
+            # Cells beyond ring r are at least r cell widths from pt (slack guards float cell binning).
+            lim = r * m.cs * (1.0 - 1e-9)
+            if best <= lim * lim:
+                return best
+        return best
+
 def pick_spaced(pts, k):
     if k <= 0 or not pts:
         return []
     k = min(k, len(pts))
     segs = part_pts(pts, k)
-    picked = []
+    grid = PickGrid(pts, k)
     for seg in segs:
         if not seg:
             continue
         best_pt = None
         best_d = -1.0
         for p in seg:
-            d = min_dist_sq(p, picked)
+            d = grid.min_dist_sq(p)
             if d > best_d:
                 best_d = d
                 best_pt = p
         if best_pt is not None:
-            picked.append(best_pt)
-    return picked
+            grid.add(best_pt)
+    return grid.picked
 
 #================================================================================================================================#
 #=> - Run -
@@ -0,0 +1,110 @@
+#================================================================================================================================#
+#=> - Imports -
+#================================================================================================================================#
+
+import sys
+sys.dont_write_bytecode = True
+
+import numpy as np
+
+#================================================================================================================================#
+#=> - Constants -
+#================================================================================================================================#
+
+PNM_CHANNELS = {b"P5": 1, b"P6": 3}
+PNM_HDR_PEEK = 1024
+PNM_WS = b" \t\r\n"
+
+#================================================================================================================================#
+#=> - Header -
+#================================================================================================================================#
+
+def parse_pnm_header(head):
+    """Return (magic, w, h, maxv, data_offset) for a binary P5/P6 header held in bytes head."""
+    magic = head[:2]
+    if magic not in PNM_CHANNELS:
+        raise ValueError("not a P5/P6 file (magic %r)" % magic)
+    vals = []
+    i = 2
+    while len(vals) < 3:
+        if i >= len(head):
+            raise ValueError("truncated pnm header")
+        c = head[i:i + 1]
+        if c == b"#":
+            while i < len(head) and head[i:i + 1] != b"\n":
+                i += 1
+            continue
+        if c in PNM_WS:
+            i += 1
+            continue
+        j = i
+        while j < len(head) and head[j:j + 1] not in PNM_WS and head[j:j + 1] != b"#":
+            j += 1
+        vals.append(int(head[i:j]))
+        i = j
+    # Exactly one whitespace byte separates maxval from the raster.
+    if i >= len(head) or head[i:i + 1] not in PNM_WS:
+        raise ValueError("truncated pnm header")
+    w, h, maxv = vals
+    if w <= 0 or h <= 0 or not 0 < maxv < 65536:
+        raise ValueError("bad pnm header values %d %d %d" % (w, h, maxv))
+    return magic, w, h, maxv, i + 1
+
+def pnm_header(w, h, channels, maxv=255):
+    magic = "P6" if channels == 3 else "P5"
+    return ("%s\n%d %d\n%d\n" % (magic, w, h, maxv)).encode("ascii")
+
+def _pnm_dtype(maxv):
+    return np.uint8 if maxv < 256 else np.dtype(">u2")
+
+#================================================================================================================================#
+#=> - Read / write -
+#================================================================================================================================#
+
+def read_pnm(path, mmap=False):
+    """Load a P5/P6 raster as (h, w) or (h, w, 3); uint8, or big-endian uint16 when maxval > 255."""
+    with open(path, "rb") as f:
+        head = f.read(PNM_HDR_PEEK)
+    magic, w, h, maxv, off = parse_pnm_header(head)
+    ch = PNM_CHANNELS[magic]
+    shape = (h, w) if ch == 1 else (h, w, ch)
+    dtype = _pnm_dtype(maxv)
+    if mmap:
+        return np.memmap(path, dtype=dtype, mode="r", offset=off, shape=shape)
+    count = h * w * ch
+    arr = np.fromfile(path, dtype=dtype, count=count, offset=off)
+    if arr.size != count:
+        raise ValueError("short pnm body: %s" % path)
+    return arr.reshape(shape)
+
+def _pnm_prep(arr, maxv):
+    arr = np.asarray(arr)
+    if arr.ndim not in (2, 3) or (arr.ndim == 3 and arr.shape[2] != 3):
+        raise ValueError("expected (h, w) or (h, w, 3) array, got %s" % (arr.shape,))
+    if maxv is None:
+        # Only unambiguous sample types pick the depth themselves; anything else needs an explicit maxv.
+        if arr.dtype == np.uint8:
+            maxv = 255
+        elif arr.dtype.kind == "u" and arr.dtype.itemsize == 2:
+            maxv = 65535
+        else:
+            raise ValueError("expected uint8 or uint16 data, got %s (pass maxv to convert)" % arr.dtype)
+    data = np.ascontiguousarray(arr, dtype=_pnm_dtype(maxv))
+    ch = 1 if arr.ndim == 2 else 3
+    return pnm_header(arr.shape[1], arr.shape[0], ch, maxv), data
+
+def pnm_bytes(arr, maxv=None):
+    """Serialise an (h, w) or (h, w, 3) array as a complete binary PNM (e.g. for tk.PhotoImage data=)."""
+    hdr, data = _pnm_prep(arr, maxv)
+    return hdr + data.tobytes()
+
+def write_pnm(path, arr, maxv=None):
+    """Write P5 for (h, w) and P6 for (h, w, 3) arrays; uint8 as maxval 255, uint16 as 65535, other dtypes need maxv."""
+    hdr, data = _pnm_prep(arr, maxv)
+    with open(path, "wb") as f:
+        f.write(hdr)
+        data.tofile(f)
+
+#================================================================================================================================#
+#=> - End -
+#================================================================================================================================#
@@ -5,8 +5,24 @@
 import sys
 sys.dont_write_bytecode = True
 
+import argparse
+import glob
+import json
 import os
+import re
 import subprocess
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+#================================================================================================================================#
+#=> - Constants -
+#================================================================================================================================#
+
+CPP_REF_RE = re.compile(r"[\w./-]+\.(?:cpp|h|so)\b")
+INC_DIR_RE = re.compile(r"-I\s*([\w./-]+)")
+QUOTED_INCLUDE_RE = re.compile(r'^\s*#\s*include\s*"([^"]+)"', re.MULTILINE)
+TIMEOUT_S = 60
 
 #================================================================================================================================#
 #=> - functions -
@@ -30,80 +46,203 @@ def get_all_tester_files(root_dir="."):
     for i, filepath in enumerate(tester_files, 1):
         print("    %d. %s" % (i, filepath))
     print("\n")
-    
+
     return tester_files, comp_files
 
-def compile_test_driver(comp_file_path):
-    original_cwd = os.getcwd()
-    comp_dir = os.path.dirname(comp_file_path)
-    comp_filename = os.path.basename(comp_file_path)
-    
+g_local_includes = {}
+
+def get_local_includes(source_path, inc_dirs):
+    # #include "..." targets of one source, searched like the compiler: its own directory, then the -I dirs.
+    # Comp scripts share most of their headers, so each (file, -I dirs) pair is resolved once per process.
+    key = (source_path, tuple(inc_dirs))
+    if key not in g_local_includes:
+        try:
+            with open(source_path, "r", errors="replace") as f:
+                names = QUOTED_INCLUDE_RE.findall(f.read())
+        except OSError:
+            names = []
+        found = []
+        for name in names:
+            for base in [os.path.dirname(source_path)] + list(inc_dirs):
+                path = os.path.normpath(os.path.join(base, name))
+                if os.path.exists(path):
+                    found.append(path)
+                    break
+        g_local_includes[key] = found
+    return g_local_includes[key]
+
+def get_comp_dependencies(comp_file_path):
+    # Conservative: every source/lib named in the script, every header in its -I dirs, and everything those sources
+    # pull in through local #include "..." lines, followed transitively.
+    comp_dir = os.path.dirname(comp_file_path) or "."
+    with open(comp_file_path, "r") as f:
+        script = f.read()
+    deps = {comp_file_path}
+    for ref in CPP_REF_RE.findall(script):
+        deps.add(os.path.normpath(os.path.join(comp_dir, ref)))
+    inc_dirs = [os.path.join(comp_dir, inc) for inc in INC_DIR_RE.findall(script)]
+    for inc_dir in inc_dirs:
+        deps.update(os.path.normpath(h) for h in glob.glob(os.path.join(inc_dir, "*.h")))
+    pending = [dep for dep in deps if dep.endswith((".cpp", ".h"))]
+    while pending:
+        for path in get_local_includes(pending.pop(), inc_dirs):
+            if path not in deps:
+                deps.add(path)
+                pending.append(path)
+    return sorted(deps)
+
+def is_test_driver_stale(comp_file_path, tester_file_path):
+    if not os.path.exists(tester_file_path):
+        return True
+    exec_mtime = os.path.getmtime(tester_file_path)
+    for dep in get_comp_dependencies(comp_file_path):
+        if os.path.exists(dep) and os.path.getmtime(dep) > exec_mtime:
+            return True
+    return False
+
+def new_phase_record():
+    return {"ok": False, "exit_code": None, "timed_out": False, "seconds": 0.0, "stdout": "", "stderr": ""}
+
+def timed_subprocess(cmd, cwd, timeout_msg, error_msg):
+    record = new_phase_record()
+    start = time.perf_counter()
     try:
-        if comp_dir:
-            os.chdir(comp_dir)
-        else:
-            os.chdir(original_cwd)
-
-        compile_result = subprocess.run(["bash", comp_filename], capture_output=True, text=True, timeout=60)
-        return (compile_result.returncode == 0, compile_result.stdout, compile_result.stderr)
-    except subprocess.TimeoutExpired:
-        return (False, "", "Compilation script timed out")
+        result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, timeout=TIMEOUT_S)
+        record.update(ok=result.returncode == 0, exit_code=result.returncode, stdout=result.stdout, stderr=result.stderr)
+    except subprocess.TimeoutExpired as e:
+        record.update(timed_out=True, stdout=_as_text(e.stdout), stderr=_as_text(e.stderr) + timeout_msg)
     except Exception as e:
-        return (False, "", "Error compiling test driver: %s" % str(e))
-    finally:
-        os.chdir(original_cwd)
+        record["stderr"] = "%s: %s" % (error_msg, str(e))
+    record["seconds"] = time.perf_counter() - start
+    return record
+
+def _as_text(data):
+    if data is None:
+        return ""
+    if isinstance(data, bytes):
+        return data.decode("utf-8", errors="replace")
+    return data
+
+def compile_test_driver(comp_file_path):
+    comp_dir = os.path.dirname(comp_file_path) or "."
+    comp_filename = os.path.basename(comp_file_path)
+    return timed_subprocess(["bash", comp_filename], comp_dir, "Compilation script timed out", "Error compiling test driver")
 
 def run_test_driver(tester_file_path):
-    original_cwd = os.getcwd()
-    test_dir = os.path.dirname(tester_file_path)
-    test_filename = os.path.basename(tester_file_path)
-    
-    try:
-        if test_dir:
-            os.chdir(test_dir)
-        else:
-            os.chdir(original_cwd)
-        
-        exec_path = "./" + test_filename
-        if not os.path.exists(exec_path):
-            return (False, "", "Executable not found: %s" % exec_path)
-        
-        run_result = subprocess.run([exec_path, "0"], capture_output=True, text=True, timeout=60)
-        return (run_result.returncode == 0, run_result.stdout, run_result.stderr)
-    
-    except subprocess.TimeoutExpired:
-        return (False, "", "Test driver timed out")
-    except Exception as e:
-        return (False, "", "Error running test driver: %s" % str(e))
-    finally:
-        os.chdir(original_cwd)
+    test_dir = os.path.dirname(tester_file_path) or "."
+    exec_path = "./" + os.path.basename(tester_file_path)
+    if not os.path.exists(os.path.join(test_dir, exec_path)):
+        record = new_phase_record()
+        record["stderr"] = "Executable not found: %s" % exec_path
+        return record
+    return timed_subprocess([exec_path, "0"], test_dir, "Test driver timed out", "Error running test driver")
+
+def run_dir_group(pairs, do_compile, force):
+    # Comp scripts in one directory share object file names, so a group runs serially in one worker.
+    records = []
+    for filepath, comp_filepath in pairs:
+        record = {"tester": filepath, "comp": comp_filepath, "status": "passed", "compile": None, "run": None}
+        records.append(record)
+        if do_compile and (force or is_test_driver_stale(comp_filepath, filepath)):
+            record["compile"] = compile_test_driver(comp_filepath)
+            if not record["compile"]["ok"]:
+                record["status"] = "compile_failed"
+                continue
+        record["run"] = run_test_driver(filepath)
+        if not record["run"]["ok"]:
+            record["status"] = "failed"
+    return records
+
+def write_json_report(path, records, wall_seconds):
+    report = {
+        "generated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "wall_seconds": wall_seconds,
+        "testers": sorted(records, key=lambda r: r["tester"]),
+    }
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+def write_junit_report(path, records, wall_seconds):
+    suite = ET.Element("testsuite", name="run_all_tests", tests=str(len(records)), time="%.3f" % wall_seconds)
+    suite.set("failures", str(sum(1 for r in records if r["status"] == "failed")))
+    suite.set("errors", str(sum(1 for r in records if r["status"] == "compile_failed")))
+    for r in sorted(records, key=lambda r: r["tester"]):
+        phases = [p for p in (r["compile"], r["run"]) if p]
+        case = ET.SubElement(suite, "testcase", classname=os.path.dirname(r["tester"]) or ".", name=os.path.basename(r["tester"]))
+        case.set("time", "%.3f" % sum(p["seconds"] for p in phases))
+        failed_phase = phases[-1] if phases else None
+        if r["status"] != "passed" and failed_phase:
+            tag = "error" if r["status"] == "compile_failed" else "failure"
+            reason = "timed out" if failed_phase["timed_out"] else "exit code %s" % failed_phase["exit_code"]
+            ET.SubElement(case, tag, message=reason)
+        ET.SubElement(case, "system-out").text = "".join(p["stdout"] for p in phases)
+        ET.SubElement(case, "system-err").text = "".join(p["stderr"] for p in phases)
+    ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+
+def format_record_line(r):
+    comp_s = "%7.2fs" % r["compile"]["seconds"] if r["compile"] else "      -"
+    run_s = "%7.2fs" % r["run"]["seconds"] if r["run"] else "      -"
+    last = r["run"] or r["compile"]
+    flag = " (timeout)" if last and last["timed_out"] else ""
+    return "    %-14s compile %s  run %s  %s%s" % (r["status"].upper(), comp_s, run_s, r["tester"], flag)
+
+def group_by_dir(tester_files, comp_files):
+    groups = {}
+    for filepath, comp_filepath in zip(tester_files, comp_files):
+        groups.setdefault(os.path.dirname(comp_filepath), []).append((filepath, comp_filepath))
+    # Largest groups first so the long serial directories start early.
+    return sorted(groups.values(), key=len, reverse=True)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compile and run every *_comp/*_tester pair below the current directory.")
+    parser.add_argument("mode", nargs="?", default="", help="'c...' to (re)compile stale test drivers before running")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes (default: cpu count)")
+    parser.add_argument("-f", "--force", action="store_true", help="recompile even when sources are unchanged")
+    parser.add_argument("--json", metavar="PATH", help="write a per-tester JSON report")
+    parser.add_argument("--junit", metavar="PATH", help="write a JUnit XML report")
+    parser.add_argument("-v", "--verbose", action="store_true", help="echo tester stdout/stderr as results arrive")
+    return parser.parse_args()
 
 #================================================================================================================================#
 #=> - Main -
 #================================================================================================================================#
 
 if __name__ == "__main__":
+    args = parse_args()
     tester_files, comp_files = get_all_tester_files()
-    do_compile = False
-    if len(sys.argv) > 1:
-        do_compile = sys.argv[1].lower().startswith("c") 
+    do_compile = args.mode.lower().startswith("c")
+
+    groups = group_by_dir(tester_files, comp_files)
+    records = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = [pool.submit(run_dir_group, group, do_compile, args.force) for group in groups]
+        for future in as_completed(futures):
+            for r in future.result():
+                records.append(r)
+                print(format_record_line(r))
+                if args.verbose or r["status"] != "passed":
+                    for phase in (r["compile"], r["run"]):
+                        if phase and phase["stdout"]:
+                            print(phase["stdout"])
+                        if phase and phase["stderr"]:
+                            print(phase["stderr"], file=sys.stderr)
+    wall_seconds = time.perf_counter() - start
+
+    if args.json:
+        write_json_report(args.json, records, wall_seconds)
+    if args.junit:
+        write_junit_report(args.junit, records, wall_seconds)
+
+    comp_failed = sorted(r["tester"] for r in records if r["status"] == "compile_failed")
+    failed = sorted(r["tester"] for r in records if r["status"] == "failed")
+    print("\n*** %d tester(s) in %.2fs" % (len(records), wall_seconds))
+    if comp_failed:
+        print("*** Failed to compile (%d): %s" % (len(comp_failed), ", ".join(comp_failed)))
+    if failed:
+        print("*** Failed (%d): %s" % (len(failed), ", ".join(failed)))
+    sys.exit(1 if failed or comp_failed else 0)
 
-    failed = 0
-    for filepath, comp_filepath in zip(tester_files, comp_files):
-        if do_compile:
-            success, stdout, stderr = compile_test_driver(comp_filepath)
-            if not success:
-                print(stdout)
-                print(stderr, file=sys.stderr)
-                continue
-        success, stdout, stderr = run_test_driver(filepath)
-        if not success:
-            failed += 1
-        if stdout:
-            print(stdout)
-        if stderr:
-            print(stderr, file=sys.stderr)
- 
 #================================================================================================================================#
 #=> - End -
 #================================================================================================================================#
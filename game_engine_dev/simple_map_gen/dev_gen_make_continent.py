@@ -6,10 +6,12 @@ import sys
 sys.dont_write_bytecode = True
 
 import os
-from collections import deque
 
 import numpy as np
 from PIL import Image
+from scipy import ndimage
+
+from dev_small_shape_perlin import SAMPLE_SCALE, fbm_field_np as perlin_fbm_field
 
 #================================================================================================================================#
 #=> - PNG byte matrix -
@@ -60,6 +62,12 @@ def fbm_field(h, w, rng, octaves, base_period):
         tw += wi
     return acc / (tw + 1e-12)
 
+def perlin_field(h, w, seed, octaves, base_period):
+    # Octave 0 spans one Perlin lattice cell per base_period pixels along x, like a value-noise layer's grid spacing;
+    # fbm_field_np normalises y by the height instead, so cells are base_period * h / w pixels tall.
+    frequency = float(w) / (SAMPLE_SCALE * max(1, base_period))
+    return perlin_fbm_field(w, h, seed, frequency=frequency, octaves=octaves)
+
 def norm01(a):
     lo = float(np.min(a))
     hi = float(np.max(a))
@@ -71,28 +79,13 @@ def radial_envelope(h, w, cx, cy, sx, sy, roundness):
     d = d / (float(np.max(d)) + 1e-12)
     return np.clip(1.0 - np.power(d, roundness), 0.0, 1.0)
 
-def flood_component(mask, sx, sy):
-    h, w = mask.shape
-    out = np.zeros_like(mask, dtype=bool)
-    if sx < 0 or sy < 0 or sx >= w or sy >= h or not mask[sy, sx]:
-        return out
-    q = deque([(sx, sy)])
-    out[sy, sx] = True
-    while q:
-        x, y = q.popleft()
-        if x + 1 < w and mask[y, x + 1] and not out[y, x + 1]:
-            out[y, x + 1] = True
-            q.append((x + 1, y))
-        if x - 1 >= 0 and mask[y, x - 1] and not out[y, x - 1]:
-            out[y, x - 1] = True
-            q.append((x - 1, y))
-        if y + 1 < h and mask[y + 1, x] and not out[y + 1, x]:
-            out[y + 1, x] = True
-            q.append((x, y + 1))
-        if y - 1 >= 0 and mask[y - 1, x] and not out[y - 1, x]:
-            out[y - 1, x] = True
-            q.append((x, y - 1))
-    return out
+def label_component(mask, sx, sy):
+    # 4-connected component of mask containing (sx, sy); empty when that cell is not set.
+    labels, _ = ndimage.label(mask)
+    lab = labels[sy, sx]
+    if lab == 0:
+        return np.zeros_like(mask, dtype=bool)
+    return labels == lab
 
 def mask_touches_border(m):
     if m.shape[0] < 2 or m.shape[1] < 2:
@@ -107,7 +100,10 @@ def build_combined_centered(params):
     sx = 0.5 * w
     sy = 0.5 * h
     env = radial_envelope(h, w, cx, cy, sx, sy, params.roundness)
-    nz = fbm_field(h, w, rng, params.noise_octaves, params.noise_base_period)
+    if params.noise_kind == "perlin":
+        nz = perlin_field(h, w, params.seed, params.noise_octaves, params.noise_base_period)
+    else:
+        nz = fbm_field(h, w, rng, params.noise_octaves, params.noise_base_period)
     env = norm01(env)
     nz = norm01(nz)
     rw = params.radial_weight
@@ -124,17 +120,22 @@ def largest_centered_continent_no_border(combined):
     lo = 0.0
     hi = 1.0
     best = np.zeros_like(combined, dtype=bool)
+    # combined >= mid only changes when mid crosses a sample value, so the count of samples at or above mid
+    # identifies the mask; late bisection steps land between the same two samples and reuse the labelling.
+    vals = np.sort(combined, axis=None)
+    comps = {}
     for _ in range(56):
         mid = 0.5 * (lo + hi)
-        mask = combined >= mid
-        if not mask[ay, ax]:
-            hi = mid
-            continue
-        comp = flood_component(mask, ax, ay)
-        if not comp.any():
+        if not combined[ay, ax] >= mid:
             hi = mid
             continue
-        if mask_touches_border(comp):
+        key = int(np.searchsorted(vals, mid, side="left"))
+        if key not in comps:
+            comp = label_component(combined >= mid, ax, ay)
+            touches = mask_touches_border(comp)
+            comps[key] = (None if touches else comp, touches)
+        comp, touches = comps[key]
+        if touches:
             lo = mid
         else:
             best = comp
@@ -162,6 +163,7 @@ class ContinentParams(object):
         "noise_base_period",
         "radial_weight",
         "noise_weight",
+        "noise_kind",
     )
 
     def __init__(m):
@@ -173,6 +175,7 @@ class ContinentParams(object):
         m.noise_base_period = 56
         m.radial_weight = 0.82
         m.noise_weight = 0.18
+        m.noise_kind = "value"
 
 #================================================================================================================================#
 #=> - Test helpers -
@@ -2,6 +2,8 @@
 #=> - Imports -
 #================================================================================================================================#
 
+import numpy as np
+
 #================================================================================================================================#
 #=> - PerlinNoise -
 #================================================================================================================================#
@@ -12,6 +14,7 @@ _GRAD2 = (
     (0.0, 1.0), (0.0, -1.0), (0.0, 1.0), (0.0, -1.0),
     (1.0, 1.0), (0.0, -1.0), (-1.0, 1.0), (0.0, -1.0),
 )
+_GRAD2_NP = np.array(_GRAD2, dtype=np.float64)
 
 def _fade(t):
     return t * t * t * (t * (t * 6.0 - 15.0) + 10.0)
@@ -27,6 +30,10 @@ def _grad2(h, x, y):
     g = _GRAD2[h & 15]
     return g[0] * x + g[1] * y
 
+def _grad2_np(h, x, y):
+    g = _GRAD2_NP[h & 15]
+    return g[..., 0] * x + g[..., 1] * y
+
 class PerlinNoise:
     def __init__(self, seed):
         perm = list(range(256))
@@ -35,6 +42,7 @@ class PerlinNoise:
             j = seed % (i + 1)
             perm[i], perm[j] = perm[j], perm[i]
         self._perm = perm + perm
+        self._perm_np = np.array(self._perm, dtype=np.int64)
 
     def noise2(self, x, y):
         xi0 = _fast_floor(x)
@@ -54,6 +62,29 @@ class PerlinNoise:
         x2 = _lerp(_grad2(ab, xf, yf - 1.0), _grad2(bb, xf - 1.0, yf - 1.0), u)
         return _lerp(x1, x2, v)
 
+    def noise2_grid(self, x, y):
+        """noise2 over broadcastable float arrays; same arithmetic per sample, so results are bit-identical."""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        xi0 = np.floor(x)
+        yi0 = np.floor(y)
+        xi = xi0.astype(np.int64) & 255
+        yi = yi0.astype(np.int64) & 255
+        xf = x - xi0
+        yf = y - yi0
+        u = _fade(xf)
+        v = _fade(yf)
+        p = self._perm_np
+        pa = p[yi]
+        pb = p[yi + 1]
+        aa = p[xi + pa]
+        ba = p[xi + 1 + pa]
+        ab = p[xi + pb]
+        bb = p[xi + 1 + pb]
+        x1 = _lerp(_grad2_np(aa, xf, yf), _grad2_np(ba, xf - 1.0, yf), u)
+        x2 = _lerp(_grad2_np(ab, xf, yf - 1.0), _grad2_np(bb, xf - 1.0, yf - 1.0), u)
+        return _lerp(x1, x2, v)
+
 #================================================================================================================================#
 #=> - FBM field -
 #================================================================================================================================#
@@ -62,7 +93,31 @@ OCTAVES_DEF = 9
 PERSISTENCE_DEF = 0.5
 SAMPLE_SCALE = 8.0
 
+def fbm_field_np(w, h, seed, frequency=5.0, lacunarity=2.0, octaves=OCTAVES_DEF, persistence=PERSISTENCE_DEF):
+    """fbm_field as an (h, w) float64 array, evaluated one octave per grid pass."""
+    gen = PerlinNoise(seed)
+    invw = 1.0 / float(w)
+    invh = 1.0 / float(h)
+    k = frequency * SAMPLE_SCALE
+    lacp = 1.0
+    amp = 1.0
+    cx = np.arange(w, dtype=np.float64).reshape(1, w)
+    cy = np.arange(h, dtype=np.float64).reshape(h, 1)
+    out = np.zeros((h, w), dtype=np.float64)
+    for _ in range(max(1, octaves)):
+        out += gen.noise2_grid(cx * (invw * k * lacp), cy * (invh * k * lacp)) * amp
+        lacp *= lacunarity
+        amp *= persistence
+    lo = float(out.min())
+    hi = float(out.max())
+    span = hi - lo + 1e-12
+    return (out - lo) / span
+
 def fbm_field(w, h, seed, frequency=5.0, lacunarity=2.0, octaves=OCTAVES_DEF, persistence=PERSISTENCE_DEF):
+    return fbm_field_np(w, h, seed, frequency, lacunarity, octaves, persistence).tolist()
+
+def fbm_field_py(w, h, seed, frequency=5.0, lacunarity=2.0, octaves=OCTAVES_DEF, persistence=PERSISTENCE_DEF):
+    # Per-sample reference for fbm_field_np.
     gen = PerlinNoise(seed)
     invw = 1.0 / float(w)
     invh = 1.0 / float(h)
@@ -9,8 +9,13 @@ import os
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.getcwd())
 
+import argparse
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from PIL import Image, ImageTk, ImageDraw
 import tkinter as tk
+import numpy as np
 import random
 import math
 
@@ -49,66 +54,66 @@ class PineTreeMaker:
             g = int(b * target_ratio)
         return (r, g, b)
    
+    def __columnFactor(m, x, width):
+        if width == 1:
+            return m.TREE_LEFT1_BRIGHTNESS_FACTOR
+        elif width == 2:
+            return m.TREE_LEFT1_BRIGHTNESS_FACTOR if x == 0 else m.TREE_RIGHT2_BRIGHTNESS_FACTOR
+        elif width == 3:
+            if x == 0:
+                return m.TREE_LEFT1_BRIGHTNESS_FACTOR
+            elif x == 1:
+                return (m.TREE_LEFT2_BRIGHTNESS_FACTOR + m.TREE_RIGHT1_BRIGHTNESS_FACTOR) / 2.0
+            else:
+                return m.TREE_RIGHT2_BRIGHTNESS_FACTOR
+        elif width == 4:
+            if x == 0:
+                return m.TREE_LEFT1_BRIGHTNESS_FACTOR
+            elif x == 1:
+                return m.TREE_LEFT2_BRIGHTNESS_FACTOR
+            elif x == 2:
+                return m.TREE_RIGHT1_BRIGHTNESS_FACTOR
+            else:
+                return m.TREE_RIGHT2_BRIGHTNESS_FACTOR
+        else:
+            if x == 0:
+                return m.TREE_LEFT1_BRIGHTNESS_FACTOR
+            elif x == 1:
+                return m.TREE_LEFT2_BRIGHTNESS_FACTOR
+            elif x == width - 2:
+                return m.TREE_RIGHT1_BRIGHTNESS_FACTOR
+            elif x == width - 1:
+                return m.TREE_RIGHT2_BRIGHTNESS_FACTOR
+            else:
+                t = float(x - 1) / float(width - 3) if width > 3 else 0.0
+                return m.TREE_LEFT2_BRIGHTNESS_FACTOR + (m.TREE_RIGHT1_BRIGHTNESS_FACTOR - m.TREE_LEFT2_BRIGHTNESS_FACTOR) * t
+
     def generateTreeDecal(m, color):
         width = m.TREE_PX_WIDTH + random.randint(-1, 1)
         height = m.TREE_PX_HEIGHT + random.randint(-1, 1)
-        decal = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        pixels = decal.load()
-        for y in range(height):
-            y_factor = (y / float(height - 1)) if height > 1 else 0.0
-            for x in range(width):
-                if x == 0 or x == width - 1:
-                    top_alpha = 255.0
-                else:
-                    center_x = (width - 1) / 2.0
-                    dist_from_center = abs(x - center_x)
-                    max_dist = center_x if width > 1 else 1.0
-                    center_weight = dist_from_center / max_dist if max_dist > 0 else 0.0
-                    top_alpha = 255.0 * center_weight + 127.0 * (1.0 - center_weight)
-                alpha = int(top_alpha * y_factor)
-                alpha += random.randint(-8, 8)
-                alpha = max(0, min(255, alpha))
-                alpha = 255 - alpha
-                r, g, b = color[0], color[1], color[2]
-                if width == 1:
-                    factor = m.TREE_LEFT1_BRIGHTNESS_FACTOR
-                elif width == 2:
-                    factor = m.TREE_LEFT1_BRIGHTNESS_FACTOR if x == 0 else m.TREE_RIGHT2_BRIGHTNESS_FACTOR
-                elif width == 3:
-                    if x == 0:
-                        factor = m.TREE_LEFT1_BRIGHTNESS_FACTOR
-                    elif x == 1:
-                        factor = (m.TREE_LEFT2_BRIGHTNESS_FACTOR + m.TREE_RIGHT1_BRIGHTNESS_FACTOR) / 2.0
-                    else:
-                        factor = m.TREE_RIGHT2_BRIGHTNESS_FACTOR
-                elif width == 4:
-                    if x == 0:
-                        factor = m.TREE_LEFT1_BRIGHTNESS_FACTOR
-                    elif x == 1:
-                        factor = m.TREE_LEFT2_BRIGHTNESS_FACTOR
-                    elif x == 2:
-                        factor = m.TREE_RIGHT1_BRIGHTNESS_FACTOR
-                    else:
-                        factor = m.TREE_RIGHT2_BRIGHTNESS_FACTOR
-                else:
-                    if x == 0:
-                        factor = m.TREE_LEFT1_BRIGHTNESS_FACTOR
-                    elif x == 1:
-                        factor = m.TREE_LEFT2_BRIGHTNESS_FACTOR
-                    elif x == width - 2:
-                        factor = m.TREE_RIGHT1_BRIGHTNESS_FACTOR
-                    elif x == width - 1:
-                        factor = m.TREE_RIGHT2_BRIGHTNESS_FACTOR
-                    else:
-                        t = float(x - 1) / float(width - 3) if width > 3 else 0.0
-                        factor = m.TREE_LEFT2_BRIGHTNESS_FACTOR + (m.TREE_RIGHT1_BRIGHTNESS_FACTOR - m.TREE_LEFT2_BRIGHTNESS_FACTOR) * t
-                r = int(r * factor)
-                g = int(g * factor)
-                b = int(b * factor)
-                r = min(255, max(0, r))
-                g = min(255, max(0, g))
-                b = min(255, max(0, b))
-                pixels[x, y] = (r, g, b, alpha)
+        # Alpha noise is drawn in the old row-major pixel order so seeded patterns are unchanged.
+        noise = np.array([random.randint(-8, 8) for _ in range(width * height)], dtype=np.int64).reshape(height, width)
+        y_factor = np.arange(height) / float(height - 1) if height > 1 else np.zeros(height)
+        top_alpha = []
+        for x in range(width):
+            if x == 0 or x == width - 1:
+                top_alpha.append(255.0)
+            else:
+                center_x = (width - 1) / 2.0
+                dist_from_center = abs(x - center_x)
+                max_dist = center_x if width > 1 else 1.0
+                center_weight = dist_from_center / max_dist if max_dist > 0 else 0.0
+                top_alpha.append(255.0 * center_weight + 127.0 * (1.0 - center_weight))
+        alpha = (np.array(top_alpha)[None, :] * y_factor[:, None]).astype(np.int64)
+        alpha = 255 - np.clip(alpha + noise, 0, 255)
+        col_rgb = []
+        for x in range(width):
+            factor = m.__columnFactor(x, width)
+            col_rgb.append([min(255, max(0, int(c * factor))) for c in color[:3]])
+        decal_arr = np.empty((height, width, 4), dtype=np.uint8)
+        decal_arr[:, :, :3] = np.array(col_rgb, dtype=np.uint8).reshape(width, 3)[None, :, :]
+        decal_arr[:, :, 3] = alpha
+        decal = Image.fromarray(decal_arr, mode='RGBA')
         decal = decal.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
         return decal
     
@@ -167,11 +172,10 @@ class BroadleafTreeMaker:
     def generateTreeDecal(m, color):
         width = m.TREE_PX_WIDTH + random.randint(-1, 1)
         height = m.TREE_PX_HEIGHT + random.randint(-1, 1)
-        decal = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        pixels = decal.load()
         center_x = (width - 1) / 2.0
         center_y = (height - 1) / 2.0
         radius = min(width, height) / 2.0
+        middle_x = []
         for y in range(height):
             y_offset = y - center_y
             max_y_offset = height / 2.0
@@ -179,47 +183,37 @@ class BroadleafTreeMaker:
             if abs(y_offset) <= arc_radius and arc_radius > 0:
                 t = math.asin(y_offset / arc_radius) if arc_radius > 0 else 0.0
                 arc_x = arc_radius * math.cos(t)
-                middle_x = center_x + arc_x * 0.5 - 1
+                middle_x.append(center_x + arc_x * 0.5 - 1)
             else:
-                middle_x = center_x
-            for x in range(width):
-                dx = x - center_x
-                dy = y - center_y
-                dist_from_center = math.sqrt(dx * dx + dy * dy)
-                if dist_from_center > radius:
-                    pixels[x, y] = (0, 0, 0, 0)
-                    continue
-                alpha = 255
-                alpha += random.randint(-8, 8)
-                alpha = max(0, min(255, alpha))
-                r, g, b = color[0], color[1], color[2]
-                leftmost_x = int(center_x - radius)
-                rightmost_x = int(center_x + radius)
-                if x <= leftmost_x:
-                    factor = m.TREE_LEFT1_BRIGHTNESS_FACTOR
-                elif x >= rightmost_x:
-                    factor = m.TREE_RIGHT2_BRIGHTNESS_FACTOR
-                else:
-                    if x < middle_x:
-                        factor = m.TREE_LEFT2_BRIGHTNESS_FACTOR
-                    else:
-                        factor = m.TREE_RIGHT1_BRIGHTNESS_FACTOR
-                r = int(r * factor)
-                g = int(g * factor)
-                b = int(b * factor)
-                noise_base = 12
-                x_shift = float(x) / float(width - 1) if width > 1 else 0.0
-                noise_min = int(-noise_base - x_shift * 80)
-                noise_max = int(noise_base - x_shift * 40)
-                rand_noise = random.randint(noise_min, noise_max)
-                r += rand_noise
-                g += rand_noise
-                b += rand_noise
-                r = int(min(255, max(0, r)))
-                g = int(min(255, max(0, g)))
-                b = int(min(255, max(0, b)))
-                b = min(255, max(0, b))
-                pixels[x, y] = (r, g, b, alpha)
+                middle_x.append(center_x)
+        noise_base = 12
+        noise_min = []
+        noise_max = []
+        for x in range(width):
+            x_shift = float(x) / float(width - 1) if width > 1 else 0.0
+            noise_min.append(int(-noise_base - x_shift * 80))
+            noise_max.append(int(noise_base - x_shift * 40))
+        ys, xs = np.mgrid[0:height, 0:width]
+        dx = xs - center_x
+        dy = ys - center_y
+        inside = ~(np.sqrt(dx * dx + dy * dy) > radius)
+        # Two draws per covered pixel (alpha, then shade noise) in the old row-major order keep seeded patterns unchanged.
+        alpha_noise = np.zeros((height, width), dtype=np.int64)
+        rand_noise = np.zeros((height, width), dtype=np.int64)
+        for y, x in zip(*[a.tolist() for a in np.nonzero(inside)]):
+            alpha_noise[y, x] = random.randint(-8, 8)
+            rand_noise[y, x] = random.randint(noise_min[x], noise_max[x])
+        leftmost_x = int(center_x - radius)
+        rightmost_x = int(center_x + radius)
+        factor = np.where(xs < np.array(middle_x)[:, None], m.TREE_LEFT2_BRIGHTNESS_FACTOR, m.TREE_RIGHT1_BRIGHTNESS_FACTOR)
+        factor = np.where(xs >= rightmost_x, m.TREE_RIGHT2_BRIGHTNESS_FACTOR, factor)
+        factor = np.where(xs <= leftmost_x, m.TREE_LEFT1_BRIGHTNESS_FACTOR, factor)
+        rgb = (np.array(color[:3], dtype=np.float64) * factor[:, :, None]).astype(np.int64)
+        rgb = np.clip(rgb + rand_noise[:, :, None], 0, 255)
+        decal_arr = np.zeros((height, width, 4), dtype=np.uint8)
+        decal_arr[inside, :3] = rgb[inside]
+        decal_arr[inside, 3] = np.clip(255 + alpha_noise[inside], 0, 255)
+        decal = Image.fromarray(decal_arr, mode='RGBA')
         return decal
     
     def generateTreeShadow(m, tree_height):
@@ -239,6 +233,59 @@ class BroadleafTreeMaker:
         shadow = shadow.rotate(m.TREE_SHADOW_ANGLE, expand=True, fillcolor=(0, 0, 0, 0))
         return shadow
 
+#================================================================================================================================#
+#=> - Compositing -
+#================================================================================================================================#
+
+# Each kernel composites one RGBA sprite onto a same-sized uint8 (h, w, 4) region in place, reproducing the old per-pixel
+# loops exactly. Pixels within one sprite never overlap, so a sprite at a time gives the loops' result.
+
+def clip_paste_box(paste_x, paste_y, width, height, canvas_size):
+    """(canvas slices, sprite slices) for the on-canvas part of a sprite pasted at paste_x, paste_y; None if fully off."""
+    x0, y0 = max(0, paste_x), max(0, paste_y)
+    x1, y1 = min(canvas_size, paste_x + width), min(canvas_size, paste_y + height)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    dst = (slice(y0, y1), slice(x0, x1))
+    src = (slice(y0 - paste_y, y1 - paste_y), slice(x0 - paste_x, x1 - paste_x))
+    return dst, src
+
+def shadow_blend_rgba(region, shadow, mask):
+    # Darken by the shadow where it is stronger than any shadow already there; the region's alpha is kept.
+    sa = shadow[:, :, 3]
+    hit = (sa > 0) & (sa > mask)
+    blend_alpha = sa[hit].astype(np.float64)[:, None] / 255.0
+    rgb = region[hit, :3] * (1.0 - blend_alpha) + shadow[hit, :3] * blend_alpha
+    region[hit, :3] = rgb.astype(np.int64)
+    mask[hit] = sa[hit]
+
+def shadow_max_rgba(region, shadow, mask):
+    # Strongest shadow wins, replacing the pixel outright.
+    sa = shadow[:, :, 3]
+    hit = (sa > 0) & (sa > mask)
+    region[hit] = shadow[hit]
+    mask[hit] = sa[hit]
+
+def paste_blend_rgba(region, decal):
+    # Image.paste(decal, box, decal): every channel, alpha included, mixes by the decal alpha with PIL's rounded /255.
+    a = decal[:, :, 3:4].astype(np.int32)
+    tmp = region.astype(np.int32) * (255 - a) + decal.astype(np.int32) * a + 128
+    region[:] = ((tmp >> 8) + tmp) >> 8
+
+def over_rgba(region, decal):
+    # Float "over" onto a possibly transparent region, truncating like the int() casts it replaces.
+    ta = decal[:, :, 3]
+    ea = region[:, :, 3]
+    empty = (ta > 0) & (ea == 0)
+    hit = (ta > 0) & (ea > 0)
+    src_alpha = ta[hit].astype(np.float64)[:, None] / 255.0
+    dst_alpha = ea[hit].astype(np.float64)[:, None] / 255.0
+    result_alpha = src_alpha + dst_alpha * (1.0 - src_alpha)
+    rgb = (decal[hit, :3] * src_alpha + region[hit, :3] * dst_alpha * (1.0 - src_alpha)) / result_alpha
+    region[hit, :3] = rgb.astype(np.int64)
+    region[hit, 3] = (result_alpha[:, 0] * 255.0).astype(np.int64)
+    region[empty] = decal[empty]
+
 #================================================================================================================================#
 #=> - Class: TreePlacementPatternGenerator -
 #================================================================================================================================#
@@ -287,65 +334,37 @@ class TreePlacementPatternGenerator:
                     break
         return locations
 
-    def __save(m):
-        if not m.output_path:
-            print ("*** Error: No output path set")
-            return
-        actual_output_path = m.__getAvailableFilename(m.output_path)
-        if not hasattr(m, 'trees_list') or not hasattr(m, 'shadows_list'):
-            print ("*** Error: No trees generated yet")
-            return
-        final_decal = Image.new('RGBA', (m.canvas_size, m.canvas_size), (0, 0, 0, 0))
-        final_pixels = final_decal.load()
-        shadow_mask = {}
+    def renderPattern(m):
+        final_arr = np.zeros((m.canvas_size, m.canvas_size, 4), dtype=np.uint8)
+        shadow_mask = np.zeros((m.canvas_size, m.canvas_size), dtype=np.uint8)
         for shadow, x, y in m.shadows_list:
             shadow_width, shadow_height = shadow.size
-            paste_x = x - shadow_width // 2
-            paste_y = y - shadow_height // 2
-            shadow_pixels = shadow.load()
-            for sy in range(shadow_height):
-                for sx in range(shadow_width):
-                    px = paste_x + sx
-                    py = paste_y + sy
-                    if px < 0 or py < 0 or px >= m.canvas_size or py >= m.canvas_size:
-                        continue
-                    sr, sg, sb, sa = shadow_pixels[sx, sy]
-                    if sa > 0:
-                        mask_key = (px, py)
-                        existing_shadow_alpha = shadow_mask.get(mask_key, 0)
-                        if sa > existing_shadow_alpha:
-                            final_pixels[px, py] = (sr, sg, sb, sa)
-                            shadow_mask[mask_key] = sa
+            box = clip_paste_box(x - shadow_width // 2, y - shadow_height // 2, shadow_width, shadow_height, m.canvas_size)
+            if box:
+                dst, src = box
+                shadow_max_rgba(final_arr[dst], np.asarray(shadow)[src], shadow_mask[dst])
         sorted_trees = sorted(m.trees_list, key=lambda item: item[2])
         for decal, x, y in sorted_trees:
             decal_width, decal_height = decal.size
-            paste_x = x - decal_width // 2
-            paste_y = y - decal_height // 2
-            decal_pixels = decal.load()
-            for dy in range(decal_height):
-                for dx in range(decal_width):
-                    px = paste_x + dx
-                    py = paste_y + dy
-                    if px < 0 or py < 0 or px >= m.canvas_size or py >= m.canvas_size:
-                        continue
-                    tr, tg, tb, ta = decal_pixels[dx, dy]
-                    if ta > 0:
-                        existing_r, existing_g, existing_b, existing_a = final_pixels[px, py]
-                        if existing_a == 0:
-                            final_pixels[px, py] = (tr, tg, tb, ta)
-                        else:
-                            src_alpha = float(ta) / 255.0
-                            dst_alpha = float(existing_a) / 255.0
-                            result_alpha = src_alpha + dst_alpha * (1.0 - src_alpha)
-                            if result_alpha > 0:
-                                new_r = int((tr * src_alpha + existing_r * dst_alpha * (1.0 - src_alpha)) / result_alpha)
-                                new_g = int((tg * src_alpha + existing_g * dst_alpha * (1.0 - src_alpha)) / result_alpha)
-                                new_b = int((tb * src_alpha + existing_b * dst_alpha * (1.0 - src_alpha)) / result_alpha)
-                                new_a = int(result_alpha * 255.0)
-                                final_pixels[px, py] = (new_r, new_g, new_b, new_a)
+            box = clip_paste_box(x - decal_width // 2, y - decal_height // 2, decal_width, decal_height, m.canvas_size)
+            if box:
+                dst, src = box
+                over_rgba(final_arr[dst], np.asarray(decal)[src])
+        final_decal = Image.fromarray(final_arr, mode='RGBA')
         bbox = final_decal.getbbox()
         if bbox:
             final_decal = final_decal.crop(bbox)
+        return final_decal
+
+    def __save(m):
+        if not m.output_path:
+            print ("*** Error: No output path set")
+            return
+        actual_output_path = m.__getAvailableFilename(m.output_path)
+        if not hasattr(m, 'trees_list') or not hasattr(m, 'shadows_list'):
+            print ("*** Error: No trees generated yet")
+            return
+        final_decal = m.renderPattern()
         final_decal.save(actual_output_path)
         print ("*** Saved decal to %s" %(actual_output_path))
 
@@ -358,7 +377,7 @@ class TreePlacementPatternGenerator:
                 return numbered_path
             counter += 1
 
-    def __init__(m, canvas_size=600, height=100, width=50, output_path=None):
+    def __init__(m, canvas_size=600, height=100, width=50, output_path=None, tree_kind=None, seed=None, headless=False):
         m.canvas_size = canvas_size
         m.height = height
         m.width = width
@@ -368,10 +387,20 @@ class TreePlacementPatternGenerator:
         m.output_path = output_path
         m.trees_list = []
         m.shadows_list = []
-        if output_path is None or "pine" in output_path:
-            m.tree_maker = PineTreeMaker()
-        else:
-            m.tree_maker = BroadleafTreeMaker()
+        m.seed = seed
+        if tree_kind is None:
+            tree_kind = "pine" if output_path is None or "pine" in output_path else "broadleaf"
+        m.tree_maker = TREE_MAKERS[tree_kind]()
+        m.root = None
+        m.left_canvas = None
+        m.right_canvas = None
+        m.left_image_id = None
+        m.right_image_id = None
+        if not headless:
+            m.__buildWidgets()
+
+    def __buildWidgets(m):
+        canvas_size = m.canvas_size
         m.root = tk.Tk()
         m.root.title("Tree Placement Pattern Generator")
         button_frame = tk.Frame(m.root)
@@ -384,8 +413,6 @@ class TreePlacementPatternGenerator:
         m.right_canvas = tk.Canvas(m.root, width=canvas_size, height=canvas_size, bg="white")
         m.left_canvas.pack(side=tk.LEFT, padx=5, pady=5)
         m.right_canvas.pack(side=tk.LEFT, padx=5, pady=5)
-        m.left_image_id = None
-        m.right_image_id = None
         
     def loadBackgroundTexture(m, texture_path):
         if not os.path.exists(texture_path):
@@ -414,7 +441,7 @@ class TreePlacementPatternGenerator:
         else:
             m.left_texture_image = Image.new('RGBA', (m.canvas_size, m.canvas_size), (255, 255, 255, 255))
             print ("*** Warning: No background texture loaded, left canvas will be white")
-        m.shadow_mask = {}
+        m.shadow_mask = np.zeros((m.canvas_size, m.canvas_size), dtype=np.uint8)
         photo_right = ImageTk.PhotoImage(m.right_marker_image)
         m.right_image_id = m.right_canvas.create_image(0, 0, anchor=tk.NW, image=photo_right)
         m.right_canvas.image = photo_right
@@ -436,8 +463,8 @@ class TreePlacementPatternGenerator:
             m.left_texture_image = texture_cropped.copy().convert('RGBA')
         else:
             m.left_texture_image = Image.new('RGBA', (m.canvas_size, m.canvas_size), (255, 255, 255, 255))
-        m.shadow_mask = {}
-        random.seed()
+        m.shadow_mask = np.zeros((m.canvas_size, m.canvas_size), dtype=np.uint8)
+        random.seed(m.seed)
         center_x = m.canvas_size // 2
         center_y = m.canvas_size // 2
         all_locations = []
@@ -458,7 +485,8 @@ class TreePlacementPatternGenerator:
         shadows_list = []
         trees_list = []
         for x, y in all_locations:
-            m.markTreeLocation(x, y)
+            if m.root:
+                m.markTreeLocation(x, y)
             color = m.tree_maker.getRandomTreeColor()
             decal = m.tree_maker.generateTreeDecal(color)
             shadow = m.tree_maker.generateTreeShadow(decal.height)
@@ -467,6 +495,8 @@ class TreePlacementPatternGenerator:
             trees_list.append((decal, x, y))
         m.trees_list = trees_list
         m.shadows_list = shadows_list
+        if not m.root:
+            return
         for shadow, x, y in shadows_list:
             m.overlayShadow(shadow, x, y)
         for decal, x, y in trees_list:
@@ -485,26 +515,10 @@ class TreePlacementPatternGenerator:
         paste_y = y - shadow_height // 2
         if paste_x < 0 or paste_y < 0 or paste_x + shadow_width > m.canvas_size or paste_y + shadow_height > m.canvas_size:
             return False
-        region = m.left_texture_image.crop((paste_x, paste_y, paste_x + shadow_width, paste_y + shadow_height))
-        shadow_pixels = shadow.load()
-        region_pixels = region.load()
-        for sy in range(shadow_height):
-            for sx in range(shadow_width):
-                sr, sg, sb, sa = shadow_pixels[sx, sy]
-                if sa > 0:
-                    px = paste_x + sx
-                    py = paste_y + sy
-                    mask_key = (px, py)
-                    existing_shadow_alpha = m.shadow_mask.get(mask_key, 0)
-                    if sa > existing_shadow_alpha:
-                        rr, rg, rb, ra = region_pixels[sx, sy]
-                        blend_alpha = float(sa) / 255.0
-                        new_r = int(rr * (1.0 - blend_alpha) + sr * blend_alpha)
-                        new_g = int(rg * (1.0 - blend_alpha) + sg * blend_alpha)
-                        new_b = int(rb * (1.0 - blend_alpha) + sb * blend_alpha)
-                        region_pixels[sx, sy] = (new_r, new_g, new_b, ra)
-                        m.shadow_mask[mask_key] = sa
-        m.left_texture_image.paste(region, (paste_x, paste_y))
+        box = (paste_x, paste_y, paste_x + shadow_width, paste_y + shadow_height)
+        region = np.array(m.left_texture_image.crop(box))
+        shadow_blend_rgba(region, np.asarray(shadow), m.shadow_mask[box[1]:box[3], box[0]:box[2]])
+        m.left_texture_image.paste(Image.fromarray(region, mode='RGBA'), (paste_x, paste_y))
         return True
     
     def overlayDecal(m, decal, x, y):
@@ -515,7 +529,10 @@ class TreePlacementPatternGenerator:
         paste_y = y - decal_height // 2
         if paste_x < 0 or paste_y < 0 or paste_x + decal_width > m.canvas_size or paste_y + decal_height > m.canvas_size:
             return False
-        m.left_texture_image.paste(decal, (paste_x, paste_y), decal)
+        box = (paste_x, paste_y, paste_x + decal_width, paste_y + decal_height)
+        region = np.array(m.left_texture_image.crop(box))
+        paste_blend_rgba(region, np.asarray(decal))
+        m.left_texture_image.paste(Image.fromarray(region, mode='RGBA'), (paste_x, paste_y))
         return True
     
     def updateLeftCanvas(m):
@@ -545,11 +562,108 @@ class TreePlacementPatternGenerator:
     def run(m):
         m.root.mainloop()
 
+#================================================================================================================================#
+#=> - Batch -
+#================================================================================================================================#
+
+TREE_MAKERS = {"pine": PineTreeMaker, "broadleaf": BroadleafTreeMaker}
+
+def plan_pattern_jobs(kinds, count, seed=None, canvas_size=600, height=50, width=100):
+    # Every pattern gets its own recorded seed, so any atlas cell can be regenerated on its own.
+    seeds = random.Random(seed)
+    jobs = []
+    for kind in kinds:
+        for i in range(count):
+            jobs.append({"index": len(jobs), "kind": kind, "seed": seeds.randrange(1 << 31),
+                         "canvas_size": canvas_size, "height": height, "width": width})
+    return jobs
+
+def run_pattern_job(job):
+    start = time.perf_counter()
+    generator = TreePlacementPatternGenerator(canvas_size=job["canvas_size"], height=job["height"], width=job["width"],
+                                              tree_kind=job["kind"], seed=job["seed"], headless=True)
+    generator.generateTreesAndShadows()
+    pattern = generator.renderPattern()
+    return job, pattern, time.perf_counter() - start
+
+def pack_atlas(patterns, cols=0):
+    """Lay patterns out on a grid of equal cells (largest pattern size); returns (atlas, [(x, y, w, h), ...])."""
+    cell_w = max(p.width for p in patterns)
+    cell_h = max(p.height for p in patterns)
+    cols = cols if cols > 0 else int(math.ceil(math.sqrt(len(patterns))))
+    rows = (len(patterns) + cols - 1) // cols
+    atlas = Image.new('RGBA', (cols * cell_w, rows * cell_h), (0, 0, 0, 0))
+    rects = []
+    for i, pattern in enumerate(patterns):
+        x = (i % cols) * cell_w + (cell_w - pattern.width) // 2
+        y = (i // cols) * cell_h + (cell_h - pattern.height) // 2
+        atlas.paste(pattern, (x, y))
+        rects.append((x, y, pattern.width, pattern.height))
+    return atlas, rects
+
+def save_atlas(atlas_path, atlas, manifest):
+    # Written next to each other through temp files, so a reader never sees half an atlas.
+    base_path, ext = os.path.splitext(atlas_path)
+    manifest_path = base_path + "_manifest.json"
+    os.makedirs(os.path.dirname(atlas_path) or ".", exist_ok=True)
+    tmp = base_path + ".tmp" + ext
+    atlas.save(tmp)
+    os.replace(tmp, atlas_path)
+    tmp = manifest_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, manifest_path)
+    return manifest_path
+
+def run_batch(atlas_path, kinds, count, jobs=1, seed=None, cols=0, canvas_size=600, height=50, width=100):
+    pattern_jobs = plan_pattern_jobs(kinds, count, seed, canvas_size, height, width)
+    patterns = [None] * len(pattern_jobs)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = [pool.submit(run_pattern_job, job) for job in pattern_jobs]
+        for n, future in enumerate(as_completed(futures), 1):
+            job, pattern, sec = future.result()
+            patterns[job["index"]] = pattern
+            print ("*** [%d/%d] %s seed %d: %dx%d (%.1fs)" %(n, len(pattern_jobs), job["kind"], job["seed"], pattern.width, pattern.height, sec))
+    atlas, rects = pack_atlas(patterns, cols)
+    manifest = {"seed": seed, "atlas": os.path.basename(atlas_path), "size": list(atlas.size), "patterns": []}
+    for job, rect in zip(pattern_jobs, rects):
+        manifest["patterns"].append(dict(job, rect=list(rect)))
+    manifest_path = save_atlas(atlas_path, atlas, manifest)
+    print ("*** Wrote %d patterns in %.1fs to %s, manifest: %s" %(len(patterns), time.perf_counter() - start, atlas_path, manifest_path))
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Tree placement pattern generator; interactive unless --atlas is given.")
+    p.add_argument("--atlas", default=None, help="render patterns headless into this RGBA atlas image (plus <atlas>_manifest.json); relative to this script's directory")
+    p.add_argument("--kind", nargs="+", choices=sorted(TREE_MAKERS), default=["pine"], help="tree kinds to render (default: pine)")
+    p.add_argument("-n", "--count", type=int, default=16, help="patterns per tree kind (default: 16)")
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes (default: cpu count)")
+    p.add_argument("--seed", type=int, default=None, help="seed for the per-pattern seeds (default: unseeded)")
+    p.add_argument("--cols", type=int, default=0, help="atlas columns (default: square-ish grid)")
+    p.add_argument("--canvas-size", type=int, default=600, help="pattern canvas size in pixels (default: 600)")
+    p.add_argument("--height", type=int, default=50, help="main cluster height (default: 50)")
+    p.add_argument("--width", type=int, default=100, help="main cluster width (default: 100)")
+    args = p.parse_args()
+    if args.count < 1:
+        print ("*** Error: --count must be at least 1, got %d" %(args.count))
+        sys.exit(1)
+    if args.cols < 0:
+        print ("*** Error: --cols must not be negative, got %d" %(args.cols))
+        sys.exit(1)
+    if args.canvas_size < 1 or args.height < 1 or args.width < 1:
+        print ("*** Error: invalid pattern size: canvas %d, cluster %d x %d" %(args.canvas_size, args.width, args.height))
+        sys.exit(1)
+    return args
+
 #================================================================================================================================#
 #=> - Main -
 #================================================================================================================================#
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.atlas:
+        run_batch(args.atlas, args.kind, args.count, args.jobs, args.seed, args.cols, args.canvas_size, args.height, args.width)
+        sys.exit(0)
     width, height = 100, 50
     texture_path = "/home/w/Projects/img-content/texture-grassland3/colors-grassland3_palette_texture_blurred.png"
     output_path = "/home/w/Projects/img-content/texture-grassland3-pine.png"
@@ -9,12 +9,16 @@ import os
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.getcwd())
 
+import argparse
+import json
 import tkinter as tk
 from PIL import Image, ImageTk, ImageDraw
 import random
 import math
+import time
 import cv2
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 #================================================================================================================================#
 #=> - Notes -
@@ -60,22 +64,13 @@ SHADER_RANGE = 15
 
 def get_avg_rgb (img):
     pixel_count = img.width * img.height
-    total_r, total_g, total_b = 0, 0, 0
-    for x in range(img.width):
-        for y in range(img.height):
-            r, g, b = img.getpixel((x, y))
-            total_r += r
-            total_g += g
-            total_b += b
-    return total_r // pixel_count, total_g // pixel_count, total_b // pixel_count
+    totals = np.asarray(img, dtype=np.int64).reshape(-1, 3).sum(axis=0)
+    return tuple(int(t) // pixel_count for t in totals)
 
 def offset_img_rgb (img, rgb_offsets):
-    new_img = img.copy()
-    for x in range(img.width):
-        for y in range(img.height):
-            r, g, b = img.getpixel((x, y))
-            new_img.putpixel((x, y), (r + rgb_offsets[0], g + rgb_offsets[1], b + rgb_offsets[2]))
-    return new_img
+    # putpixel clamps out-of-range channels to 0..255; clip does the same.
+    arr = np.asarray(img, dtype=np.int32) + np.array(rgb_offsets[:3], dtype=np.int32)
+    return Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8), img.mode)
 
 def optain_shader_images ():
     prefix, suffix = "farm_row_shader_", "px.png"
@@ -156,6 +151,14 @@ class FarmLayout:
             m.shader_scaled_list.append(shader_scaled)
             m.shader_scaled_rotated_list.append(shader_scaled.rotate(90, expand=True))
         
+        if frame is not None:
+            m.__build_widgets(frame)
+        
+        m.__generate_texture()
+        m.__draw_layout()
+        m.__update_canvas()
+
+    def __build_widgets (m, frame):
         m.button_row = tk.Frame(frame)
         m.button_row.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
         
@@ -196,10 +199,6 @@ class FarmLayout:
         m.canvas.images = []
         
         m.__update_button_states()
-        
-        m.__generate_texture()
-        m.__draw_layout()
-        m.__update_canvas()
 
     def __generate_texture (m):
         m.texture_img = Image.new("RGB", (RAW_WIDTH, RAW_HEIGHT), (200, 200, 200))
@@ -256,6 +255,8 @@ class FarmLayout:
         return layouts
 
     def __update_button_states (m):
+        if m.frame is None:
+            return
         layouts = m.__get_layouts()
         num_layouts = len(layouts[m.layout_idx])
         for i, (btn1, btn2) in enumerate(zip(m.tilling_buttons, m.shader_buttons)):
@@ -415,6 +416,8 @@ class FarmLayout:
         m.__update_canvas()
     
     def __update_canvas (m):
+        if m.frame is None:
+            return
         m.canvas.delete("all")
         m.canvas.images = []
         photo = ImageTk.PhotoImage(m.layout_img)
@@ -463,6 +466,13 @@ class TileMorpher:
         m.tile_img = Image.new("RGB", (CANVAS_WIDTH, CANVAS_HEIGHT), (255, 255, 255))
         m.current_morphed_img = None
         
+        if frame is not None:
+            m.__build_widgets(frame)
+        
+        m.__draw_tile()
+        m.__update_canvas()
+
+    def __build_widgets (m, frame):
         m.button_row = tk.Frame(frame)
         m.button_row.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
         
@@ -475,9 +485,6 @@ class TileMorpher:
         m.canvas = tk.Canvas(frame, width=500, height=500, bg="white")
         m.canvas.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=5, pady=5)
         m.canvas.images = []
-        
-        m.__draw_tile()
-        m.__update_canvas()
 
     def __draw_tile (m):
         m.tile_img = Image.new("RGB", (CANVAS_WIDTH, CANVAS_HEIGHT), (255, 255, 255))
@@ -499,6 +506,8 @@ class TileMorpher:
         m.__update_canvas()
     
     def __update_canvas (m):
+        if m.frame is None:
+            return
         m.canvas.delete("all")
         m.canvas.images = []
         
@@ -603,11 +612,7 @@ class TileMorpher:
         morphed_array = np.array(morphed_img)
         dst_mask_array = np.array(dst_mask)
         magenta_rgba = np.array([255, 0, 255, 255], dtype=np.uint8)
-        
-        for y in range(CANVAS_HEIGHT):
-            for x in range(CANVAS_WIDTH):
-                if dst_mask_array[y, x] == 0:
-                    morphed_array[y, x] = magenta_rgba
+        morphed_array[dst_mask_array == 0] = magenta_rgba
         
         m.current_morphed_img = Image.fromarray(morphed_array)
         
@@ -626,33 +631,20 @@ class TileMorpher:
             left = 0
             right = width
             
-            for y in range(height):
-                row = rgb_channels[y, :]
-                if not np.all(np.all(row == magenta, axis=1)):
-                    top = y
-                    break
-            
-            for y in range(height - 1, -1, -1):
-                row = rgb_channels[y, :]
-                if not np.all(np.all(row == magenta, axis=1)):
-                    bottom = y + 1
-                    break
-            
-            for x in range(width):
-                col = rgb_channels[:, x]
-                if not np.all(np.all(col == magenta, axis=1)):
-                    left = x
-                    break
-            
-            for x in range(width - 1, -1, -1):
-                col = rgb_channels[:, x]
-                if not np.all(np.all(col == magenta, axis=1)):
-                    right = x + 1
-                    break
+            content = np.any(rgb_channels != magenta, axis=2)
+            rows = np.flatnonzero(content.any(axis=1))
+            cols = np.flatnonzero(content.any(axis=0))
+            if rows.size:
+                top, bottom = int(rows[0]), int(rows[-1]) + 1
+            if cols.size:
+                left, right = int(cols[0]), int(cols[-1]) + 1
             
             cropped = m.current_morphed_img.crop((left, top, right, bottom))
             resized = cropped.resize((TILE_WIDTH, TILE_HEIGHT), Image.NEAREST) # 
-            resized.save("farm_tile_%s_%s.png" %(name_tag, str(index).zfill(3)))
+            path = "farm_tile_%s_%s.png" %(name_tag, str(index).zfill(3))
+            resized.save(path)
+            return path
+        return None
 
     def count_tile_whites (m):
         scaled_width = TILE_WIDTH * m.scale_factor
@@ -677,25 +669,10 @@ class TileMorpher:
         if m.current_morphed_img is not None:
             canvas_img.paste(m.current_morphed_img, (0, 0), m.current_morphed_img)
         
-        pixels = canvas_img.load()
-        mask_pixels = mask.load()
-        
-        white = (255, 255, 255)
-        count_inside = 0
-        count_outside = 0
-        
-        width, height = canvas_img.size
-        for y in range(height):
-            for x in range(width):
-                pixel = pixels[x, y]
-                is_white = pixel == white
-                is_inside = mask_pixels[x, y] > 0
-                
-                if is_white:
-                    if is_inside:
-                        count_inside += 1
-                    else:
-                        count_outside += 1
+        is_white = np.all(np.asarray(canvas_img) == 255, axis=2)
+        is_inside = np.asarray(mask) > 0
+        count_inside = int(np.count_nonzero(is_white & is_inside))
+        count_outside = int(np.count_nonzero(is_white & ~is_inside))
         
         return count_inside, count_outside
 
@@ -703,9 +680,10 @@ class TileMorpher:
 
     def save_farm_tile (m, name_tag):
         m.__morph_image()
-        m.__save_image(name_tag, m.index)
+        path = m.__save_image(name_tag, m.index)
         m.index += 1
         print("*** Saved farm tile: %d" %m.index)
+        return path
 
 #================================================================================================================================#
 #=> - Class: FarmGen -
@@ -717,6 +695,11 @@ class FarmGen:
         m.root = root
         m.color_set = color_set
         
+        if root is None:
+            m.farm_layout = FarmLayout(None, m.color_set)
+            m.tile_morpher = TileMorpher(None, m.farm_layout.getFarmLayout)
+            return
+        
         m.canvas_frame = tk.Frame(root)
         m.canvas_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=5, pady=5)
         
@@ -743,24 +726,42 @@ class FarmGen:
     def set_rotation_index (m, index):
         m.farm_layout.set_rotation_index(index)
 
+    def set_tile_index (m, index):
+        m.tile_morpher.index = index
+
     def save_farm_layout (m, name_tag):
         m.farm_layout.draw_farm_layout()
-        m.tile_morpher.save_farm_tile(name_tag)
+        return m.tile_morpher.save_farm_tile(name_tag)
 
 #================================================================================================================================#
 #=> - Helper Functions -
 #================================================================================================================================#
 
-def run_program (name_tag):
-    if name_tag == "deep_green":
-        color_set = ColorSet()
-    else:
-        print("*** Invalid program/color-set")
-        exit(1)
-    root = tk.Tk()
-    root.title("Farm Generator")
-    farm_gen = FarmGen(root, color_set)
+class FarmJobPlanner:
+    # Stands in for FarmGen while run_program's sequence is replayed: records each save as a standalone job.
+
+    def __init__ (m, color_set):
+        m.color_set = color_set
+        m.jobs = []
+        m.state = {"layout": 0, "tilling": [True, True, True, True], "shaders": [0, 0, 0, 0], "rotation": 0}
 
+    def set_farm_layout (m, index):
+        m.state["layout"] = index
+
+    def set_tilling_orientation (m, orientations):
+        m.state["tilling"] = list(orientations[:4])
+
+    def set_shader_indices (m, indices):
+        m.state["shaders"] = list(indices[:4])
+
+    def set_rotation_index (m, index):
+        m.state["rotation"] = index
+
+    def save_farm_layout (m, name_tag):
+        job = dict(m.state, index=len(m.jobs), name_tag=name_tag, colors=list(m.color_set.get_colors()))
+        m.jobs.append(job)
+
+def plan_farm_jobs (name_tag, farm_gen, color_set):
     farm_gen.set_farm_layout(0)
     color_set.shuffle_colors()
     farm_gen.set_tilling_orientation([False, True, True, False])
@@ -801,17 +802,68 @@ def run_program (name_tag):
     color_set.shuffle_colors()
     farm_gen.save_farm_layout(name_tag)
 
+g_worker_farm_gen = None
+
+def run_farm_job (job):
+    # One headless FarmGen per worker process; the noise and shader images are loaded once and reused across jobs.
+    global g_worker_farm_gen
+    start = time.perf_counter()
+    if g_worker_farm_gen is None:
+        g_worker_farm_gen = FarmGen(None, ColorSet())
+    farm_gen = g_worker_farm_gen
+    farm_gen.color_set.colors = list(job["colors"])
+    farm_gen.set_farm_layout(job["layout"])
+    farm_gen.set_tilling_orientation(job["tilling"])
+    farm_gen.set_shader_indices(job["shaders"])
+    farm_gen.set_rotation_index(job["rotation"])
+    farm_gen.set_tile_index(job["index"])
+    path = farm_gen.save_farm_layout(job["name_tag"])
+    return job, path, time.perf_counter() - start
+
+def save_manifest (path, manifest):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+def run_program (name_tag, jobs=1, seed=None):
+    if name_tag == "deep_green":
+        color_set = ColorSet()
+    else:
+        print("*** Invalid program/color-set")
+        exit(1)
+    random.seed(seed)
+    planner = FarmJobPlanner(color_set)
+    plan_farm_jobs(name_tag, planner, color_set)
+
+    manifest_path = "farm_tile_%s_manifest.json" % name_tag
+    manifest = {"name_tag": name_tag, "seed": seed, "tiles": {}}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = [pool.submit(run_farm_job, job) for job in planner.jobs]
+        for n, future in enumerate(as_completed(futures), 1):
+            job, path, sec = future.result()
+            manifest["tiles"]["%03d" % job["index"]] = dict(job, path=path, sec=round(sec, 3))
+            save_manifest(manifest_path, manifest)
+            print("*** [%d/%d] %s (%.1fs)" % (n, len(planner.jobs), path, sec))
+    print("*** Wrote %d farm tiles in %.1fs, manifest: %s" % (len(planner.jobs), time.perf_counter() - start, manifest_path))
+
+def parse_args ():
+    p = argparse.ArgumentParser(description="Generate a farm tile set (headless in TEST_MODE).")
+    p.add_argument("program", nargs="?", default=None, help="color set / program name, e.g. deep_green")
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes (default: cpu count)")
+    p.add_argument("--seed", type=int, default=None, help="seed for the color shuffles (default: unseeded)")
+    return p.parse_args()
+
 #================================================================================================================================#
 #=> - Main -
 #================================================================================================================================#
 
 if __name__ == "__main__":
-    program = None
-    if len(sys.argv) > 1:
-        program = sys.argv[1]
+    args = parse_args()
 
     if TEST_MODE:
-        run_program(program)
+        run_program(args.program, args.jobs, args.seed)
     else:
         root = tk.Tk()
         root.title("Farm Generator")
@@ -47,23 +47,49 @@ class TriangleMorpher:
         max_x = int(min(output_width - 1, max(v[0] for v in tri_adj)))
         min_y = int(max(0, min(v[1] for v in tri_adj)))
         max_y = int(min(output_height - 1, max(v[1] for v in tri_adj)))
+        if max_x < min_x or max_y < min_y:
+            return image
         
-        for y in range(min_y, max_y + 1):
-            for x in range(min_x, max_x + 1):
-                if m.__pointInTriangle(x, y, v1_d, v2_d, v3_d):
-                    bary = m.__barycentric(x, y, v1_d, v2_d, v3_d)
-                    if bary[0] >= 0 and bary[1] >= 0 and bary[2] >= 0:
-                        src_x = int(bary[0] * v1_s[0] + bary[1] * v2_s[0] + bary[2] * v3_s[0])
-                        src_y = int(bary[0] * v1_s[1] + bary[1] * v2_s[1] + bary[2] * v3_s[1])
-                        
-                        if 0 <= src_x < source_image.shape[1] and 0 <= src_y < source_image.shape[0]:
-                            if is_rgb:
-                                image[y, x] = source_image[src_y, src_x]
-                            else:
-                                image[y, x] = source_image[src_y, src_x]
+        # Whole bounding box at once; the expressions keep the scalar code's operation order so results match bit for bit.
+        xs = np.arange(min_x, max_x + 1, dtype=np.float64).reshape(1, -1)
+        ys = np.arange(min_y, max_y + 1, dtype=np.float64).reshape(-1, 1)
+        inside = m.__pointInTriangleGrid(xs, ys, v1_d, v2_d, v3_d)
+        if not inside.any():
+            return image
+        b0, b1, b2 = m.__barycentricGrid(xs, ys, v1_d, v2_d, v3_d)
+        inside &= (b0 >= 0) & (b1 >= 0) & (b2 >= 0)
+        src_x = np.trunc(b0 * v1_s[0] + b1 * v2_s[0] + b2 * v3_s[0])
+        src_y = np.trunc(b0 * v1_s[1] + b1 * v2_s[1] + b2 * v3_s[1])
+        inside &= (src_x >= 0) & (src_x < source_image.shape[1]) & (src_y >= 0) & (src_y < source_image.shape[0])
+        yy, xx = np.nonzero(inside)
+        image[yy + min_y, xx + min_x] = source_image[src_y[yy, xx].astype(np.intp), src_x[yy, xx].astype(np.intp)]
         
         return image
 
+    def __barycentricGrid (m, xs, ys, v1, v2, v3):
+        v0x, v0y = v2[0] - v1[0], v2[1] - v1[1]
+        v1x, v1y = v3[0] - v1[0], v3[1] - v1[1]
+        v2x, v2y = xs - v1[0], ys - v1[1]
+        dot00 = v0x * v0x + v0y * v0y
+        dot01 = v0x * v1x + v0y * v1y
+        dot02 = v0x * v2x + v0y * v2y
+        dot11 = v1x * v1x + v1y * v1y
+        dot12 = v1x * v2x + v1y * v2y
+        inv_denom = 1 / (dot00 * dot11 - dot01 * dot01)
+        u = (dot11 * dot02 - dot01 * dot12) * inv_denom
+        v = (dot00 * dot12 - dot01 * dot02) * inv_denom
+        return (1 - u - v, u, v)
+
+    def __pointInTriangleGrid (m, xs, ys, v1, v2, v3):
+        def sign(p2, p3):
+            return (xs - p3[0]) * (p2[1] - p3[1]) - (p2[0] - p3[0]) * (ys - p3[1])
+        d1 = sign(v1, v2)
+        d2 = sign(v2, v3)
+        d3 = sign(v3, v1)
+        has_neg = (d1 < 0) | (d2 < 0) | (d3 < 0)
+        has_pos = (d1 > 0) | (d2 > 0) | (d3 > 0)
+        return ~(has_neg & has_pos)
+
     def __barycentric (m, x, y, v1, v2, v3):
         v0x, v0y = v2[0] - v1[0], v2[1] - v1[1]
         v1x, v1y = v3[0] - v1[0], v3[1] - v1[1]
@@ -16,6 +16,8 @@ import glob
 import random
 import tkinter as tk
 
+from dat31_mmap import Dat31Mmap
+
 #================================================================================================================================#
 #=> - C++ Library Setup -
 #================================================================================================================================#
@@ -37,11 +39,8 @@ lib.dat31_write_item.argtypes = [ctypes.c_void_p, ctypes.c_int]
 lib.dat31_finish.restype = None
 lib.dat31_finish.argtypes = []
 
-lib.dat31_start_reader.restype = None
-lib.dat31_start_reader.argtypes = [ctypes.c_char_p]
-
-lib.dat31_get_item.restype = ctypes.c_void_p
-lib.dat31_get_item.argtypes = [ctypes.c_int, ctypes.POINTER(ctypes.c_int)]
+lib.dat31_finish_indexed.restype = None
+lib.dat31_finish_indexed.argtypes = []
 
 def dat31_start_writer(path):
     lib.dat31_start_writer(path.encode('utf-8'))
@@ -54,25 +53,32 @@ def dat31_write_item(data, size):
         data_ptr = ctypes.cast(arr, ctypes.c_void_p)
     lib.dat31_write_item(data_ptr, size)
 
-def dat31_finish():
-    lib.dat31_finish()
+def dat31_finish(with_index=False):
+    if with_index:
+        lib.dat31_finish_indexed()
+    else:
+        lib.dat31_finish()
+
+# Reading goes through dat31_mmap; items are memoryviews into the mapped file.
+dat31_reader = None
 
 def dat31_start_reader(path):
-    lib.dat31_start_reader(path.encode('utf-8'))
+    global dat31_reader
+    if dat31_reader is not None:
+        dat31_reader.close()
+    dat31_reader = Dat31Mmap(path)
 
 def dat31_get_item(index):
-    size_out = ctypes.c_int()
-    ptr = lib.dat31_get_item(index, ctypes.byref(size_out))
-    if ptr and size_out.value > 0:
-        data = ctypes.string_at(ptr, size_out.value)
-        return data, size_out.value
+    item = dat31_reader.get_item(index) if dat31_reader is not None else None
+    if item:
+        return item, len(item)
     return None, 0
 
 #================================================================================================================================#
 #=> - Function for building and testing mountain decal set
 #================================================================================================================================#
 
-def process_texture_set(tex_set_path, output_path):
+def process_texture_set(tex_set_path, output_path, with_index=True):
     png_pattern = os.path.join(tex_set_path, "*.png")
     png_files = sorted(glob.glob(png_pattern))
     
@@ -101,7 +107,7 @@ def process_texture_set(tex_set_path, output_path):
         print("*** Image shape: %s -> RGB shape: %s" % (str(img_array.shape), str(rgb_array.shape)))
         print("*** Image size: %d bytes" % (rgb_array.size * rgb_array.itemsize))
         print("*** Calculated expected size: %d bytes" % expected_nbytes)
-    dat31_finish()
+    dat31_finish(with_index)
     print("*** Saved texture set to: %s" % output_path)
 
 def test_dat31_viewer(dat31_path):
@@ -122,19 +128,14 @@ def test_dat31_viewer(dat31_path):
             return
         
         index = current_idx[0]
-        size_out = ctypes.c_int()
-        ptr = lib.dat31_get_item(index, ctypes.byref(size_out))
+        img_data, actual_data_size = dat31_get_item(index)
         
-        if not ptr or size_out.value == 0:
+        if img_data is None:
             print("*** Error: Failed to read item %d" % current_idx[0])
             current_idx[0] += 1
             load_and_display_image()
             return
         
-        print("*** C function returned: ptr=%s, size_out=%d" % (hex(ptr), size_out.value))
-        
-        img_data = ctypes.string_at(ptr, size_out.value)
-        actual_data_size = len(img_data)
         print("*** Read data size: %d bytes" % actual_data_size)
         
         num_pixels = actual_data_size // 3
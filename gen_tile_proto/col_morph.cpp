@@ -5,6 +5,8 @@
 #include <cstring>
 #include <cmath>
 #include <algorithm>
+#include <thread>
+#include <vector>
 #include "col_morph.h"
 
 //================================================================================================================================
@@ -194,6 +196,33 @@ void morph_tile (u8* src_img, int src_w, int src_h, int channels, pt top, pt rig
     }
 }
 
+// Morphs count tiles laid out back to back in src_imgs/dst_imgs with one deltas entry per tile. src_stride is the number of
+// source tiles to step per output tile: 1 for a stack of distinct tiles, 0 to morph one source tile count times.
+void morph_tiles (u8* src_imgs, int count, int src_stride, int src_w, int src_h, int channels, pt top, pt right, pt bottom, pt left, const deltas* ds, u8* dst_imgs, int num_threads) {
+    if (count <= 0) {
+        return;
+    }
+    long tile_size = (long)src_w * src_h * channels;
+    auto run = [=] (int first, int last) {
+        for (int i = first; i < last; i++) {
+            morph_tile(src_imgs + (long)i * src_stride * tile_size, src_w, src_h, channels, top, right, bottom, left, ds[i], dst_imgs + (long)i * tile_size);
+        }
+    };
+    num_threads = std::max(1, std::min(num_threads, count));
+    if (num_threads == 1) {
+        run(0, count);
+        return;
+    }
+    std::vector<std::thread> workers;
+    int chunk = (count + num_threads - 1) / num_threads;
+    for (int first = 0; first < count; first += chunk) {
+        workers.emplace_back(run, first, std::min(count, first + chunk));
+    }
+    for (auto& w : workers) {
+        w.join();
+    }
+}
+
 }
 
 //================================================================================================================================
@@ -20,6 +20,7 @@ extern "C" {
 #endif
 
 void morph_tile (u8* src_img, int src_w, int src_h, int channels, pt top, pt right, pt bottom, pt left, deltas d, u8* dst_img);
+void morph_tiles (u8* src_imgs, int count, int src_stride, int src_w, int src_h, int channels, pt top, pt right, pt bottom, pt left, const deltas* ds, u8* dst_imgs, int num_threads);
 
 #ifdef __cplusplus
 }
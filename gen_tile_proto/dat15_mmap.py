@@ -0,0 +1,126 @@
+#================================================================================================================================#
+#=> - Imports -
+#================================================================================================================================#
+
+import sys
+sys.dont_write_bytecode = True
+
+import mmap
+import struct
+
+import numpy as np
+
+#================================================================================================================================#
+#=> - Constants -
+#================================================================================================================================#
+
+# Both headers are 32-bit gcc bitfields (see dat15_io.cpp), stored little-endian:
+#   dat15_top_hdr: num_rows in bits 0..15, num_cols in bits 16..31
+#   dat15_hdr:     has_next in bit 0, size in bits 1..15
+DAT15_HDR = struct.Struct("<I")
+DAT15_SIZE_MASK = 0x7FFF
+
+def _c_mod (a, b):
+    q = abs(a) % abs(b)
+    return -q if a < 0 else q
+
+#================================================================================================================================#
+#=> - Class: Dat15Mmap
+#================================================================================================================================#
+
+class Dat15Mmap:
+    """Read-only dat15 container: mmaps the file and indexes item offsets once; items are returned without copying."""
+
+    def __init__ (m, path):
+        m.path = path
+        m.num_rows = 0
+        m.num_cols = 0
+        m.offsets = np.zeros(0, dtype=np.int64)
+        m.sizes = np.zeros(0, dtype=np.int32)
+        m.mm = None
+        m.view = memoryview(b"")
+        with open(path, "rb") as f:
+            try:
+                m.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                print("*** Error: Failed to read top header: %s" % path)
+                return
+        m.view = memoryview(m.mm)
+        if len(m.mm) < DAT15_HDR.size:
+            print("*** Error: Failed to read top header: %s" % path)
+            return
+        top = DAT15_HDR.unpack_from(m.mm, 0)[0]
+        m.num_rows = top & 0xFFFF
+        m.num_cols = top >> 16
+        m.__buildIndex()
+
+    def __buildIndex (m):
+        # Same stopping rules as Dat15Reader: a short header or short item ends the list.
+        offsets, sizes = [], []
+        pos = DAT15_HDR.size
+        end = len(m.mm)
+        while pos + DAT15_HDR.size <= end:
+            hdr = DAT15_HDR.unpack_from(m.mm, pos)[0]
+            size = (hdr >> 1) & DAT15_SIZE_MASK
+            pos += DAT15_HDR.size
+            if pos + size > end:
+                break
+            offsets.append(pos)
+            sizes.append(size)
+            pos += size
+            if not hdr & 1:
+                break
+        m.offsets = np.array(offsets, dtype=np.int64)
+        m.sizes = np.array(sizes, dtype=np.int32)
+
+    def __len__ (m):
+        return len(m.offsets)
+
+    def item_index (m, row, col):
+        # C semantics: % truncates toward zero, so negative row/col never wrap.
+        if m.num_rows == 0 or m.num_cols == 0:
+            return -1
+        row = _c_mod(int(row), m.num_rows)
+        col = _c_mod(int(col), m.num_cols)
+        idx = row * m.num_cols + col
+        if idx < 0 or idx >= len(m.offsets):
+            return -1
+        return idx
+
+    def get_item (m, idx):
+        """memoryview of item idx inside the mapping, or None."""
+        if idx < 0 or idx >= len(m.offsets):
+            return None
+        off = int(m.offsets[idx])
+        return m.view[off:off + int(m.sizes[idx])]
+
+    def get_item_at (m, row, col):
+        return m.get_item(m.item_index(row, col))
+
+    def get_array (m, idx, shape=None):
+        """uint8 NumPy view of item idx (optionally reshaped), or None."""
+        item = m.get_item(idx)
+        if item is None:
+            return None
+        arr = np.frombuffer(item, dtype=np.uint8)
+        return arr if shape is None else arr.reshape(shape)
+
+    def close (m):
+        # Views handed out keep the mapping alive; release ours and let mmap close once they are gone.
+        m.view.release()
+        if m.mm is not None:
+            try:
+                m.mm.close()
+            except BufferError:
+                pass
+            m.mm = None
+
+    def __enter__ (m):
+        return m
+
+    def __exit__ (m, exc_type, exc, tb):
+        m.close()
+
+#================================================================================================================================#
+#=> - End -
+#================================================================================================================================#
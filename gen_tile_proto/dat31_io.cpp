@@ -14,6 +14,15 @@ struct dat31_hdr {
     unsigned int size : 31;
 };
 
+// Optional trailer after the last item: u64 header offset per item, then this footer at end of file.
+// Sequential readers stop at has_next == 0 and never see it.
+struct dat31_idx_footer {
+    unsigned int count;
+    char magic[4];
+};
+
+static const char DAT31_IDX_MAGIC[4] = {'D', '3', '1', 'X'};
+
 //================================================================================================================================
 //=> - Helper functions -
 //================================================================================================================================
@@ -79,6 +88,8 @@ const void* Dat31Reader::get_item (int index, int* size_out) {
 Dat31Writer::Dat31Writer (const char* path) {
     m_ptr = fopen (path, "wb");
     m_pending.clear ();
+    m_offsets.clear ();
+    m_pos = 0;
 }
 
 Dat31Writer::~Dat31Writer () {
@@ -92,8 +103,10 @@ void Dat31Writer::flush_pending (bool has_next) {
     if (m_pending.empty ()) {
         return;
     }
+    m_offsets.push_back (m_pos);
     write_header (m_ptr, m_pending.size (), has_next);
     fwrite (m_pending.data (), 1, m_pending.size (), m_ptr);
+    m_pos += sizeof (dat31_hdr) + m_pending.size ();
     m_pending.clear ();
 }
 
@@ -107,6 +120,19 @@ void Dat31Writer::finish () {
     flush_pending (false);
 }
 
+void Dat31Writer::finish_indexed () {
+    flush_pending (false);
+    if (m_offsets.empty ()) {
+        return;
+    }
+    fwrite (m_offsets.data (), sizeof (unsigned long long), m_offsets.size (), m_ptr);
+    dat31_idx_footer footer;
+    footer.count = m_offsets.size ();
+    memcpy (footer.magic, DAT31_IDX_MAGIC, sizeof (footer.magic));
+    fwrite (&footer, sizeof (footer), 1, m_ptr);
+    m_offsets.clear ();
+}
+
 //================================================================================================================================
 //=> - Static globals -
 //================================================================================================================================
@@ -141,6 +167,14 @@ void dat31_finish () {
     }
 }
 
+void dat31_finish_indexed () {
+    if (g_writer) {
+        g_writer->finish_indexed();
+        delete g_writer;
+        g_writer = nullptr;
+    }
+}
+
 void dat31_start_reader (const char* path) {
     if (g_reader) {
         delete g_reader;
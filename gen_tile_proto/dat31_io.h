@@ -27,9 +27,12 @@ public:
     ~Dat31Writer ();
     void write (const void* data, int size);
     void finish ();
+    void finish_indexed ();
 private:
     FILE* m_ptr;
     std::vector<unsigned char> m_pending;
+    std::vector<unsigned long long> m_offsets;
+    long m_pos;
     void flush_pending (bool m_has_next);
 };
 
@@ -44,6 +47,7 @@ extern "C" {
 void dat31_start_writer (const char* path);
 void dat31_write_item (const void* data, int size);
 void dat31_finish ();
+void dat31_finish_indexed ();
 void dat31_start_reader (const char* path);
 const void* dat31_get_item (int index, int* size_out);
 
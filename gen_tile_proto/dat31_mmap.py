@@ -0,0 +1,114 @@
+#================================================================================================================================#
+#=> - Imports -
+#================================================================================================================================#
+
+import sys
+sys.dont_write_bytecode = True
+
+import mmap
+import struct
+
+import numpy as np
+
+#================================================================================================================================#
+#=> - Constants -
+#================================================================================================================================#
+
+# dat31_hdr is a 32-bit gcc bitfield (see dat31_io.cpp), stored little-endian: has_next in bit 0, size in bits 1..31.
+# Files written with dat31_finish_indexed() end in <u64 header offset> * count + <u32 count, b"D31X">.
+DAT31_HDR = struct.Struct("<I")
+DAT31_FOOTER = struct.Struct("<I4s")
+DAT31_IDX_MAGIC = b"D31X"
+
+#================================================================================================================================#
+#=> - Class: Dat31Mmap
+#================================================================================================================================#
+
+class Dat31Mmap:
+    """Read-only dat31 container: O(1) lookups through the trailing index when present, one header scan otherwise."""
+
+    def __init__ (m, path):
+        m.path = path
+        m.hdr_offsets = np.zeros(0, dtype=np.int64)
+        m.indexed = False
+        m.mm = None
+        m.view = memoryview(b"")
+        with open(path, "rb") as f:
+            try:
+                m.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return
+        m.view = memoryview(m.mm)
+        if not m.__loadIndex():
+            m.__scanIndex()
+
+    def __loadIndex (m):
+        end = len(m.mm)
+        if end < DAT31_FOOTER.size:
+            return False
+        count, magic = DAT31_FOOTER.unpack_from(m.mm, end - DAT31_FOOTER.size)
+        idx_pos = end - DAT31_FOOTER.size - 8 * count
+        if magic != DAT31_IDX_MAGIC or count == 0 or idx_pos < 0:
+            return False
+        hdr_offsets = np.frombuffer(m.mm, dtype="<u8", count=count, offset=idx_pos).astype(np.int64)
+        if hdr_offsets.max() + DAT31_HDR.size > idx_pos:
+            return False
+        # Item headers are read on lookup, so opening costs the index alone.
+        m.hdr_offsets = hdr_offsets
+        m.indexed = True
+        return True
+
+    def __scanIndex (m):
+        # Same stopping rules as Dat31Reader: a short header or short item ends the list.
+        hdr_offsets = []
+        pos = 0
+        end = len(m.mm)
+        while pos + DAT31_HDR.size <= end:
+            hdr = DAT31_HDR.unpack_from(m.mm, pos)[0]
+            size = hdr >> 1
+            if pos + DAT31_HDR.size + size > end:
+                break
+            hdr_offsets.append(pos)
+            pos += DAT31_HDR.size + size
+            if not hdr & 1:
+                break
+        m.hdr_offsets = np.array(hdr_offsets, dtype=np.int64)
+
+    def __len__ (m):
+        return len(m.hdr_offsets)
+
+    def get_item (m, index):
+        """memoryview of item index (wrapped modulo the item count, like dat31_get_item), or None."""
+        if len(m.hdr_offsets) == 0:
+            return None
+        off = int(m.hdr_offsets[index % len(m.hdr_offsets)])
+        size = DAT31_HDR.unpack_from(m.mm, off)[0] >> 1
+        off += DAT31_HDR.size
+        return m.view[off:off + size]
+
+    def get_array (m, index, shape=None):
+        """uint8 NumPy view of item index (optionally reshaped), or None."""
+        item = m.get_item(index)
+        if item is None:
+            return None
+        arr = np.frombuffer(item, dtype=np.uint8)
+        return arr if shape is None else arr.reshape(shape)
+
+    def close (m):
+        m.view.release()
+        if m.mm is not None:
+            try:
+                m.mm.close()
+            except BufferError:
+                pass
+            m.mm = None
+
+    def __enter__ (m):
+        return m
+
+    def __exit__ (m, exc_type, exc, tb):
+        m.close()
+
+#================================================================================================================================#
+#=> - End -
+#================================================================================================================================#
@@ -18,6 +18,8 @@ import cv2
 import ctypes
 import os
 
+from dat15_mmap import Dat15Mmap
+
 #================================================================================================================================#
 #=> - C++ Library Setup -
 #================================================================================================================================#
@@ -39,12 +41,6 @@ lib.dat15_write_item.argtypes = [ctypes.c_void_p, ctypes.c_int]
 lib.dat15_finish.restype = None
 lib.dat15_finish.argtypes = []
 
-lib.dat15_start_reader.restype = None
-lib.dat15_start_reader.argtypes = [ctypes.c_char_p]
-
-lib.dat15_get_item.restype = ctypes.c_void_p
-lib.dat15_get_item.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.POINTER(ctypes.c_int)]
-
 def dat15_start_writer(path, num_cols, num_rows):
     lib.dat15_start_writer(path.encode('utf-8'), num_cols, num_rows)
 
@@ -59,18 +55,23 @@ def dat15_write_item(data, size):
 def dat15_finish():
     lib.dat15_finish()
 
+# Items are memoryviews into the mapped file; nothing is copied until a caller asks for it.
+dat15_reader = None
+
 def dat15_start_reader(path):
-    lib.dat15_start_reader(path.encode('utf-8'))
+    global dat15_reader
+    if dat15_reader is not None:
+        dat15_reader.close()
+    dat15_reader = Dat15Mmap(path)
 
 def dat15_get_item_count():
-    return lib.dat15_get_item_count()
+    return len(dat15_reader) if dat15_reader is not None else 0
 
 def dat15_get_item(row, col):
-    size_out = ctypes.c_int()
-    ptr = lib.dat15_get_item(row, col, ctypes.byref(size_out))
-    if ptr and size_out.value > 0:
-        return ctypes.string_at(ptr, size_out.value)
-    return None
+    if dat15_reader is None:
+        return None
+    item = dat15_reader.get_item_at(row, col)
+    return item if item else None
 
 #================================================================================================================================#
 #=> - Class: TileCropper
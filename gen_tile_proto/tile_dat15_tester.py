@@ -10,37 +10,29 @@ os.chdir(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.getcwd())
 
 import numpy as np
-import ctypes
 from PIL import Image
 import cv2
 
+from dat15_mmap import Dat15Mmap
+
 #================================================================================================================================#
-#=> - C++ Library Setup -
+#=> - Dat15 reader -
 #================================================================================================================================#
 
-lib_path = os.path.join(os.path.dirname(__file__), "dat15_io.so")
-if not os.path.exists(lib_path):
-    lib_path = os.path.join(os.path.dirname(__file__), "..", "tile_gen_proto", "dat15_io.so")
-if not os.path.exists(lib_path):
-    raise FileNotFoundError("*** Error: %s not found. Please compile dat15_io.cpp first." % (lib_path))
-
-lib = ctypes.CDLL(lib_path)
-
-lib.dat15_start_reader.restype = None
-lib.dat15_start_reader.argtypes = [ctypes.c_char_p]
-
-lib.dat15_get_item.restype = ctypes.c_void_p
-lib.dat15_get_item.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.POINTER(ctypes.c_int)]
+# Items are memoryviews into the mapped file; nothing is copied until a caller asks for it.
+dat15_reader = None
 
 def dat15_start_reader(path):
-    lib.dat15_start_reader(path.encode('utf-8'))
+    global dat15_reader
+    if dat15_reader is not None:
+        dat15_reader.close()
+    dat15_reader = Dat15Mmap(path)
 
 def dat15_get_item(row, col):
-    size_out = ctypes.c_int()
-    ptr = lib.dat15_get_item(row, col, ctypes.byref(size_out))
-    if ptr and size_out.value > 0:
-        return ctypes.string_at(ptr, size_out.value)
-    return None
+    if dat15_reader is None:
+        return None
+    item = dat15_reader.get_item_at(row, col)
+    return item if item else None
 
 #================================================================================================================================#
 #=> - Class: Dat15Tester
@@ -88,6 +88,38 @@ def morph_tile(src_data, src_w, src_h, channels, top_pt, right_pt, bottom_pt, le
     else:
         return bytes(dst_arr)
 
+morph_lib.morph_tiles.restype = None
+morph_lib.morph_tiles.argtypes = [ctypes.POINTER(ctypes.c_uint8), ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, pt, pt, pt, pt, ctypes.POINTER(deltas), ctypes.POINTER(ctypes.c_uint8), ctypes.c_int]
+
+def morph_tiles(src_tiles, top_pt, right_pt, bottom_pt, left_pt, ds, dst_tiles=None, num_threads=1):
+    """Morph a stack of tiles in one native call.
+
+    src_tiles is (n, h, w, c) uint8, or a single (h, w, c) tile morphed n times; ds is (n, 4) ints in deltas field order
+    (top_dy, right_dy, bottom_dy, left_dy). Returns the (n, h, w, c) morphed stack (dst_tiles when given).
+    """
+    src_tiles = np.ascontiguousarray(src_tiles, dtype=np.uint8)
+    ds = np.ascontiguousarray(ds, dtype=np.int32).reshape(-1, 4)
+    count = len(ds)
+    if src_tiles.ndim == 3:
+        src_stride = 0
+        tile_shape = src_tiles.shape
+    else:
+        src_stride = 1
+        tile_shape = src_tiles.shape[1:]
+        if len(src_tiles) != count:
+            raise ValueError("*** Error: %d tiles but %d deltas" % (len(src_tiles), count))
+    src_h, src_w, channels = tile_shape
+    if dst_tiles is None:
+        dst_tiles = np.empty((count,) + tile_shape, dtype=np.uint8)
+    elif dst_tiles.shape != (count,) + tile_shape or dst_tiles.dtype != np.uint8 or not dst_tiles.flags.c_contiguous:
+        raise ValueError("*** Error: dst_tiles must be a contiguous uint8 array of shape %s" % (((count,) + tile_shape),))
+    
+    src_ptr = src_tiles.ctypes.data_as(ctypes.POINTER(ctypes.c_uint8))
+    ds_ptr = ds.ctypes.data_as(ctypes.POINTER(deltas))
+    dst_ptr = dst_tiles.ctypes.data_as(ctypes.POINTER(ctypes.c_uint8))
+    morph_lib.morph_tiles(src_ptr, count, src_stride, src_w, src_h, channels, top_pt, right_pt, bottom_pt, left_pt, ds_ptr, dst_ptr, num_threads)
+    return dst_tiles
+
 #================================================================================================================================#
 #=> - Class: TileMorpher
 #================================================================================================================================#
@@ -149,6 +181,9 @@ class TileMorpher:
         m.time_btn = tk.Button(m.button_frame, text="Time", command=m.__time)
         m.time_btn.pack(side=tk.LEFT, padx=5)
         
+        m.time_batch_btn = tk.Button(m.button_frame, text="Time Batch", command=m.__timeBatch)
+        m.time_batch_btn.pack(side=tk.LEFT, padx=5)
+        
         m.canv = tk.Canvas(root, width=m.canv_w, height=m.canv_h, bg="gray")
         m.canv.pack(padx=5, pady=5)
         
@@ -226,6 +261,19 @@ class TileMorpher:
         time_per_tile = elapsed_time / num_iterations
         print ("*** Total time taken for %d morhping operations: %.4f seconds" % (num_iterations, elapsed_time))
 
+    def __timeBatch (m):
+        num_iterations = 1000
+        ds = np.zeros((num_iterations, 4), dtype=np.int32)
+        ds[:, 0] = np.random.randint(-40, 41, num_iterations) // int(m.scale)
+        ds[:, 1] = np.random.randint(-20, 21, num_iterations) // int(m.scale)
+        ds[:, 3] = np.random.randint(-20, 21, num_iterations) // int(m.scale)
+        dst_tiles = np.empty((num_iterations, m.morph_h, m.tile_w, 3), dtype=np.uint8)
+        for num_threads in [1, os.cpu_count() or 1]:
+            start_time = time.perf_counter()
+            morph_tiles(m.src_morph_img, m.top_pt, m.right_pt, m.bottom_pt, m.left_pt, ds, dst_tiles, num_threads)
+            elapsed_time = time.perf_counter() - start_time
+            print ("*** Batch of %d morphing operations on %d thread(s): %.4f seconds" % (num_iterations, num_threads, elapsed_time))
+
     def __morphAndDisplay (m, display=True):
         d = deltas(int(m.top_dy / m.scale), int(m.right_dy / m.scale), int(m.bottom_dy / m.scale), int(m.left_dy / m.scale))
         morphed_img = np.zeros((m.morph_h, m.tile_w, 3), dtype=np.uint8)
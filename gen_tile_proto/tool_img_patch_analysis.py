@@ -10,7 +10,6 @@ os.chdir(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.getcwd())
 
 import numpy as np
-from collections import deque
 from PIL import Image
 import matplotlib.pyplot as plt
 
@@ -28,35 +27,46 @@ class PatchAnalyzer:
         else:
             m.image_array = None
 
+    def __labelRuns (m, keys):
+        # Pass 1: split every row into runs of equal colour and collect the vertical run-to-run contacts.
+        height, width = keys.shape
+        starts = np.ones((height, width), dtype=bool)
+        starts[:, 1:] = keys[:, 1:] != keys[:, :-1]
+        run_of = np.cumsum(starts.ravel()).reshape(height, width) - 1
+        run_start = np.flatnonzero(starts.ravel())
+        same_up = keys[1:, :] == keys[:-1, :]
+        edges = np.stack([run_of[1:, :][same_up], run_of[:-1, :][same_up]], axis=1)
+        edges = np.unique(edges, axis=0) if len(edges) else edges.reshape(0, 2)
+        # Pass 2: union-find over runs; hook the larger root under the smaller, then compress paths.
+        parent = np.arange(len(run_start))
+        a, b = edges[:, 0], edges[:, 1]
+        while True:
+            ra, rb = parent[a], parent[b]
+            diff = ra != rb
+            if not diff.any():
+                break
+            np.minimum.at(parent, np.maximum(ra[diff], rb[diff]), np.minimum(ra[diff], rb[diff]))
+            while True:
+                jumped = parent[parent]
+                if np.array_equal(jumped, parent):
+                    break
+                parent = jumped
+        run_len = np.diff(np.append(run_start, height * width))
+        return parent, run_start, run_len
+
     def __analyzePatches (m):
         if m.image_array is None:
             return
         height, width = m.image_array.shape[:2]
-        claimed = np.zeros((height, width), dtype=bool)
-        patch_sizes = []
-        pixel_count = 0
-        for y in range(height):
-            for x in range(width):
-                if not claimed[y, x]:
-                    target_color = tuple(m.image_array[y, x])
-                    queue = deque()
-                    queue.append((x, y))
-                    claimed[y, x] = True
-                    pixel_count = 1
-                    while len(queue) > 0:
-                        cx, cy = queue.popleft()
-                        neighbors = [(cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)]
-                        for nx, ny in neighbors:
-                            if 0 <= nx < width and 0 <= ny < height:
-                                if not claimed[ny, nx]:
-                                    neighbor_color = tuple(m.image_array[ny, nx])
-                                    if neighbor_color == target_color:
-                                        claimed[ny, nx] = True
-                                        queue.append((nx, ny))
-                                        pixel_count += 1
-                    patch_sizes.append((pixel_count, target_color))
-                    pixel_count = 0
-        patch_sizes.sort(key=lambda x: x[0])
+        rgb = m.image_array.reshape(height, width, 3).astype(np.int32)
+        keys = (rgb[:, :, 0] << 16) | (rgb[:, :, 1] << 8) | rgb[:, :, 2]
+        root, run_start, run_len = m.__labelRuns(keys)
+        # Every root is the first run of its patch, so ascending roots is the row-major discovery order.
+        roots, comp = np.unique(root, return_inverse=True)
+        sizes = np.bincount(comp, weights=run_len).astype(np.int64)
+        colors = m.image_array.reshape(-1, 3)[run_start[roots]]
+        order = np.argsort(sizes, kind="stable")
+        patch_sizes = list(zip(sizes[order].tolist(), map(tuple, colors[order].tolist())))
         m.patch_sizes = patch_sizes
         print ("*** Found %d patches" %(len(patch_sizes)))
         m.__saveResults()
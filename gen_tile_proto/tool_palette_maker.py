@@ -9,10 +9,12 @@ import os
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.getcwd())
 
+import heapq
 import numpy as np
 import random
 import tkinter as tk
 from PIL import Image, ImageTk
+from scipy.spatial import cKDTree
 
 #================================================================================================================================#
 #=> - Class: PaletteMaker
@@ -33,109 +35,104 @@ class PaletteMaker:
     def __analyzeColors (m):
         if m.image_array is None:
             return
-        unique_colors = set()
-        color_to_coords = {}
-        height, width = m.image_array.shape[:2]
-        for y in range(height):
-            for x in range(width):
-                r, g, b = m.image_array[y, x]
-                color_tuple = (int(r), int(g), int(b))
-                unique_colors.add(color_tuple)
-                if color_tuple not in color_to_coords:
-                    color_to_coords[color_tuple] = []
-                color_to_coords[color_tuple].append((x, y))
-        m.color_to_coords = color_to_coords
-        print ("*** Found %d unique colors" %(len(unique_colors)))
+        # Unique colours in first-seen (row-major) order, with their pixel counts and a per-pixel index.
+        packed = m.image_array.reshape(-1, 3).astype(np.int32)
+        packed = (packed[:, 0] << 16) | (packed[:, 1] << 8) | packed[:, 2]
+        uniq, first, inverse, counts = np.unique(packed, return_index=True, return_inverse=True, return_counts=True)
+        order = np.argsort(first, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        uniq = uniq[order]
+        m.colors = np.stack([(uniq >> 16) & 255, (uniq >> 8) & 255, uniq & 255], axis=1).astype(np.int32)
+        m.color_counts = counts[order].astype(np.int64)
+        m.color_inverse = rank[inverse.reshape(-1)]
+        print ("*** Found %d unique colors" %(len(m.colors)))
         m.__mergeColors()
 
-    def __colorDistance (m, color1, color2):
-        r1, g1, b1 = color1
-        r2, g2, b2 = color2
-        return abs(r1 - r2) + abs(g1 - g2) + abs(b1 - b2)
+    def __nearestActive (m, i, active, tree, tree_idx):
+        # Nearest active colour to colour i (L1), widening the KD-tree query until one turns up.
+        k = 2
+        while True:
+            k = min(k, len(tree_idx))
+            dists, hits = tree.query(m.colors[i], k=k, p=1)
+            for d, h in zip(np.atleast_1d(dists), np.atleast_1d(hits)):
+                j = int(tree_idx[h])
+                if j != i and active[j]:
+                    return int(d), m.__lowestAt(i, d, active, tree, tree_idx)
+            if k == len(tree_idx):
+                return None
+            k *= 4
+
+    def __lowestAt (m, i, dist, active, tree, tree_idx):
+        # The KD-tree orders equidistant hits arbitrarily; the old pair scan took the lowest first-seen index.
+        hits = tree_idx[tree.query_ball_point(m.colors[i], r=dist, p=1)]
+        hits = hits[active[hits] & (hits != i)]
+        return int(hits.min())
 
     def __mergeColors (m):
-        if m.image_array is None or m.color_to_coords is None:
+        # Greedy merge: repeatedly take the closest pair of remaining colours (L1) and fold the less used one
+        # into the other. Nearest neighbours come from a KD-tree and are refreshed lazily through a heap.
+        if m.image_array is None:
             return
-        color_list = list(m.color_to_coords.keys())
-        initial_count = len(color_list)
-        print ("*** Starting merge: %d colors -> %d colors" %(initial_count, m.num_colors))
-        print ("*** Creating distance table for %d colors" %(initial_count), end='\r')
-        sys.stdout.flush()
-        distance_table = {}
-        for i in range(initial_count):
-            for j in range(i + 1, initial_count):
-                color1 = color_list[i]
-                color2 = color_list[j]
-                distance = m.__colorDistance(color1, color2)
-                if color1 < color2:
-                    distance_table[(color1, color2)] = distance
-                else:
-                    distance_table[(color2, color1)] = distance
-        print ("")
-        iteration = 0
-        while len(color_list) > m.num_colors:
-            if len(distance_table) == 0:
-                break
-            min_distance = min(distance_table.values())
-            closest_pair = None
-            for pair, dist in distance_table.items():
-                if dist == min_distance:
-                    closest_pair = pair
-                    break
-            if closest_pair is None:
-                break
-            color1, color2 = closest_pair
-            count1 = len(m.color_to_coords[color1])
-            count2 = len(m.color_to_coords[color2])
-            if count1 < count2:
-                merge_from, merge_to = color1, color2
-            elif count2 < count1:
-                merge_from, merge_to = color2, color1
-            else:
-                if random.random() < 0.5:
-                    merge_from, merge_to = color1, color2
+        n = len(m.colors)
+        print ("*** Starting merge: %d colors -> %d colors" %(n, m.num_colors))
+        active = np.ones(n, dtype=bool)
+        counts = m.color_counts.copy()
+        remaining = n
+        if n > max(1, m.num_colors):
+            tree_idx = np.arange(n)
+            tree = cKDTree(m.colors)
+            dists = tree.query(m.colors, k=2, p=1)[0][:, 1]
+            balls = tree.query_ball_point(m.colors, r=dists, p=1)
+            heap = [(int(d), i, min(h for h in ball if h != i)) for i, (d, ball) in enumerate(zip(dists, balls))]
+            heapq.heapify(heap)
+            iteration = 0
+            while remaining > m.num_colors and heap:
+                dist, i, j = heapq.heappop(heap)
+                if not active[i]:
+                    continue
+                if not active[j]:
+                    nn = m.__nearestActive(i, active, tree, tree_idx)
+                    if nn is not None:
+                        heapq.heappush(heap, (nn[0], i, nn[1]))
+                    continue
+                if counts[i] != counts[j]:
+                    merge_from, merge_to = (i, j) if counts[i] < counts[j] else (j, i)
                 else:
-                    merge_from, merge_to = color2, color1
-            keys_to_remove = []
-            for pair in distance_table.keys():
-                if merge_from in pair:
-                    keys_to_remove.append(pair)
-            for key in keys_to_remove:
-                del distance_table[key]
-            m.color_to_coords[merge_to].extend(m.color_to_coords[merge_from])
-            del m.color_to_coords[merge_from]
-            color_list.remove(merge_from)
-            iteration += 1
-            remaining = len(color_list)
-            print ("*** Merging iteration %d: %d colors remaining" %(iteration, remaining), end='\r')
-            sys.stdout.flush()
-        print ("")
-        final_colors = list(m.color_to_coords.keys())
+                    # Coin flip between the pair ordered by RGB value, as the old pair keys were.
+                    lo, hi = (i, j) if tuple(m.colors[i]) < tuple(m.colors[j]) else (j, i)
+                    merge_from, merge_to = (lo, hi) if random.random() < 0.5 else (hi, lo)
+                active[merge_from] = False
+                counts[merge_to] += counts[merge_from]
+                remaining -= 1
+                if remaining * 2 < len(tree_idx):
+                    tree_idx = np.flatnonzero(active)
+                    tree = cKDTree(m.colors[tree_idx])
+                if merge_to == i:
+                    nn = m.__nearestActive(i, active, tree, tree_idx)
+                    if nn is not None:
+                        heapq.heappush(heap, (nn[0], i, nn[1]))
+                iteration += 1
+                print ("*** Merging iteration %d: %d colors remaining" %(iteration, remaining), end='\r')
+                sys.stdout.flush()
+            print ("")
+        final_colors = [tuple(int(c) for c in m.colors[i]) for i in np.flatnonzero(active)]
         print ("*** Merge complete: %d colors" %(len(final_colors)))
         m.setPalette(final_colors)
-        m.__repaintImage()
+        m.__repaintImage(final_colors)
         with open(m.save_path, "w") as ptr:
-            for color, coords in m.color_to_coords.items():
+            for color in final_colors:
                 ptr.write("%s\n" %(":".join([str(c) for c in color])))
 
-    def __repaintImage (m):
-        if m.image_array is None or m.color_to_coords is None:
+    def __repaintImage (m, palette_colors):
+        # Nearest palette colour (L1, first on ties) per unique colour, then scattered back through the pixel index.
+        if m.image_array is None or not palette_colors:
             return
         height, width = m.image_array.shape[:2]
-        repainted = np.zeros((height, width, 3), dtype=np.uint8)
-        palette_colors = list(m.color_to_coords.keys())
-        for y in range(height):
-            for x in range(width):
-                original_color = tuple(m.image_array[y, x])
-                closest_color = None
-                min_dist = float('inf')
-                for palette_color in palette_colors:
-                    dist = m.__colorDistance(original_color, palette_color)
-                    if dist < min_dist:
-                        min_dist = dist
-                        closest_color = palette_color
-                if closest_color is not None:
-                    repainted[y, x] = closest_color
+        palette = np.array(palette_colors, dtype=np.int32)
+        dists = np.abs(m.colors[:, None, :] - palette[None, :, :]).sum(axis=2)
+        nearest = palette[np.argmin(dists, axis=1)].astype(np.uint8)
+        repainted = nearest[m.color_inverse].reshape(height, width, 3)
         m.image_array = repainted
         m.__displayImage()
         img = Image.fromarray(repainted, mode='RGB')